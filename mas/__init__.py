@@ -14,6 +14,9 @@ Submodules
     graph
     visualization
     agent
+    experiment
+    run
 """
 
-__all__ = ["graph", "visualization", "agent"]
+__all__ = ["graph", "visualization", "agent", "experiment",
+           "run"]
@@ -223,6 +223,16 @@ class Agent:
                                                                    field,
                                                                    value)
 
+    def rng(self):
+        """Get the random generator of the agent: a stream of the simulation
+        independent of the other agents, so that seeded simulations are
+        reproducible.
+
+        :returns: The random generator of the agent.
+        :rtype: :class:`random.Random`
+        """
+        return self._simulation.ask_for_rng(self)
+
     def status(self):
         """Get the status of the agent.
 
@@ -1,3 +1,4 @@
+import numpy as np
 import random
 
 class AgentManager:
@@ -5,17 +6,26 @@ class AgentManager:
     Used for managing all the data about agents during a simulation.
     """
 
+    NO_PORT = -1
+
     def __init__(self,
                  agents_list,
                  topology,
                  prior_knowledge=dict(),
                  possible_latencies=[1],
                  initial_status="",
-                 number_of_pebbles=0):
+                 number_of_pebbles=0,
+                 rng=None):
         """An agent manager. It encapsulates all the data about agents in an
         agent list: their identifiers; their positions; the information they
         store; ...
 
+        Each agent is given a dense index (its rank in agents_list), and the
+        positions (as vertex identifiers), ports back, last moves, latencies,
+        statuses (interned as small integers) and pebbles of the agents are
+        stored in numpy arrays, so that queries about all the agents are
+        vectorized.
+
         :param agents_list: List of agents to manage.
         :type agents_list: list.
 
@@ -39,85 +49,87 @@ class AgentManager:
             every agent.
             Default to 0.
         :type number_of_pebbles: int, optional
+
+        :param rng: Random generator drawing the identifiers, latencies and
+            positions that are not given by the agents.
+            Default to None (the :mod:`random` module).
+        :type rng: :class:`random.Random`, optional
         """
+        self._random = random if rng is None else rng
+        self._topology = topology
 
-        self._agents_positions = dict()
+        self._agents = list(agents_list)
+        self._agents_index = {agent: i for i, agent in enumerate(self._agents)}
+        size = len(self._agents)
+
+        # Positions as vertex identifiers, and as vertices for the scalar
+        # getters (None when the agents were moved all at once).
+        self._agents_positions = np.empty(size, np.int32)
+        self._agents_vertices = [None] * size
         self._init_position(agents_list, topology)
 
-        self._agents_id = dict()
+        # Identifiers, and the reverse index of the agents by identifier.
+        self._agents_id = np.empty(size, np.int64)
+        self._ids_index = dict()
         self._init_ids(agents_list)
 
-        self._agents_latency = dict()
+        self._agents_latency = np.empty(size, np.int32)
         self._init_latencies(agents_list, possible_latencies)
 
-        self._agents_positions_contains_mate = dict()
-        self._init_positions_contains_mate(agents_list)
+        self._agents_positions_contains_mate = np.zeros(size, bool)
+        self._contains_mate_outdated = False
 
-        self._agents_port_back = dict()
-        self._init_agents_port_back(agents_list)
+        self._agents_port_back = np.full(size, self.NO_PORT, np.int32)
 
-        self._agents_last_move = dict()
-        self._init_agents_last_move(agents_list)
+        self._agents_last_move = np.zeros(size, np.int32)
 
         self._agents_prior_knowledge = prior_knowledge
 
         self._agents_memory = dict()
         self._init_agents_memory(agents_list)
 
-        self._agents_status = dict()
+        self._statuses = []
+        self._status_codes = dict()
+        self._agents_status = np.empty(size, np.int16)
         self._init_agents_status(agents_list, initial_status)
 
-        self._agents_pebbles = dict()
         self._max_pebbles = number_of_pebbles
-        self._init_agents_pebbles(agents_list, number_of_pebbles)
-
-    def _init_agents_last_move(self, agents_list):
-        for agent in agents_list:
-            self._set_agent_last_move(agent, 0)
+        self._agents_pebbles = np.full(size, number_of_pebbles, np.int32)
 
     def _init_agents_memory(self, agents_list):
         for agent in agents_list:
             self._agents_memory[agent] = dict()
 
-    def _init_agents_pebbles(self, agents_list, number_of_pebbles):
-        for agent in agents_list:
-            self._agents_pebbles[agent] = number_of_pebbles
-
-    def _init_agents_port_back(self, agents_list):
-        for agent in agents_list:
-            self._set_agent_port_back(agent, None)
-
     def _init_agents_status(self, agents_list, initial_status):
-        for agent in agents_list:
-            self.set_agent_status(agent, initial_status)
+        self._agents_status[:] = self._status_code(initial_status)
 
     def _init_ids(self, agents_list):
-        ids = random.sample(range(0, 50000), len(agents_list))
-        i = 0
-        for agent in agents_list:
+        ids = self._random.sample(range(0, max(50000, 2 * len(agents_list))),
+                                  len(agents_list))
+        for i, agent in enumerate(agents_list):
             id = agent.desired_id()
-            if (id is None) or (id in self._agents_id.values()):
+            if (id is None) or (id in self._ids_index):
                 id = ids[i]
-            self._agents_id[agent] = id
-            i += 1
+            self._ids_index[id] = i
+            self._agents_id[i] = id
 
     def _init_latencies(self, agents_list, possible_latencies):
-        for agent in agents_list:
+        for i, agent in enumerate(agents_list):
             latency = agent.desired_latency()
             if latency is None:
-                latency = random.choice(possible_latencies)
-            self._agents_latency[agent] = latency
+                latency = self._random.choice(possible_latencies)
+            self._agents_latency[i] = latency
 
     def _init_position(self, agents_list, topology):
-        for agent in agents_list:
+        vertices = None
+        for i, agent in enumerate(agents_list):
             pos = agent.desired_initial_position()
             if pos is None:
-                pos = random.choice(list(topology.vertices()))
-            self._agents_positions[agent] = pos
-
-    def _init_positions_contains_mate(self, agents_list):
-        for agent in agents_list:
-            self._agents_positions_contains_mate[agent] = False
+                if vertices is None:
+                    vertices = list(topology.vertices())
+                pos = self._random.choice(vertices)
+            self._agents_positions[i] = topology.get_vertex_id(pos)
+            self._agents_vertices[i] = pos
 
     def add_pebble_to_agent(self, agent):
         """Increase the number of pebbles of an agent.
@@ -148,7 +160,19 @@ class AgentManager:
         :returns: A step.
         :rtype: int
         """
-        return self._agents_last_move[agent]
+        return self._agents_last_move.item(self._agents_index[agent])
+
+    def get_agent_by_id(self, id):
+        """Get an agent given its unique identifier.
+
+        :param id: A unique agent identifier.
+        :type id: int
+
+        :returns: The agent identified by id, None if there is no such agent.
+        :rtype: class:`mas.agent.Agent.Agent`
+        """
+        index = self._ids_index.get(id)
+        return None if index is None else self._agents[index]
 
     def get_agent_id(self, agent):
         """Get the unique identifier of the agent.
@@ -159,7 +183,31 @@ class AgentManager:
         :returns: The unique identifier of the agent.
         :rtype: int
         """
-        return self._agents_id[agent]
+        return self._agents_id.item(self._agents_index[agent])
+
+    def get_agent_index(self, agent):
+        """Get the index of the agent in the arrays of the manager.
+
+        :param agent: A mobile agent.
+        :type agent: class:`mas.agent.Agent.Agent`
+
+        :returns: The rank of the agent in the list of managed agents.
+        :rtype: int
+        """
+        return self._agents_index[agent]
+
+    def get_agent_index_by_id(self, id):
+        """Get the index in the arrays of the manager of the agent with a given
+        unique identifier.
+
+        :param id: A unique agent identifier.
+        :type id: int
+
+        :returns: The rank of the agent in the list of managed agents, None if
+            there is no such agent.
+        :rtype: int
+        """
+        return self._ids_index.get(id)
 
     def get_agent_latency(self, agent):
         """Get the latency of the agent.
@@ -170,7 +218,7 @@ class AgentManager:
         :returns: The latency of the agent.
         :rtype: int
         """
-        return self._agents_latency[agent]
+        return self._agents_latency.item(self._agents_index[agent])
 
     def get_agent_memory(self, agent, field=None):
         """Get the agent's memory.
@@ -197,7 +245,17 @@ class AgentManager:
         :returns: The status of the agent.
         :rtype: str
         """
-        return self._agents_status[agent]
+        code = self._agents_status.item(self._agents_index[agent])
+        return self._statuses[code]
+
+    def get_all_agents(self):
+        """Get every managed agent, in the order of their indices (see
+        :meth:`get_agent_index()`).
+
+        :returns: The agents.
+        :rtype: list
+        """
+        return self._agents
 
     def get_all_agents_memory(self):
         """Get the memory of every agent.
@@ -213,7 +271,35 @@ class AgentManager:
         :returns: The position of every agent.
         :rtype: dict
         """
-        return self._agents_positions
+        return dict(zip(self._agents, self._positions_vertices()))
+
+    def get_all_agents_latencies(self):
+        """Get the latency of every agent, indexed by agent index (see
+        :meth:`get_agent_index()`).
+
+        :returns: A read-only view of the latencies.
+        :rtype: numpy.array
+        """
+        return self._read_only(self._agents_latency)
+
+    def get_all_agents_ports_back(self):
+        """Get the port back of every agent, indexed by agent index (see
+        :meth:`get_agent_index()`).
+
+        :returns: A read-only view of the ports back, where
+            ``AgentManager.NO_PORT`` stands for no port.
+        :rtype: numpy.array
+        """
+        return self._read_only(self._agents_port_back)
+
+    def get_all_agents_positions_ids(self):
+        """Get the identifiers of the positions of every agent, indexed by
+        agent index (see :meth:`get_agent_index()`).
+
+        :returns: A read-only view of the positions.
+        :rtype: numpy.array
+        """
+        return self._read_only(self._agents_positions)
 
     def get_agent_port_back(self, agent):
         """Get the port number of the edge the agent comes from.
@@ -225,7 +311,8 @@ class AgentManager:
             If the agent did not perform any move, returns None.
         :rtype: int
         """
-        return self._agents_port_back[agent]
+        port = self._agents_port_back.item(self._agents_index[agent])
+        return None if port == self.NO_PORT else port
 
     def get_agent_position(self, agent):
         """Get the position of an agent.
@@ -236,7 +323,7 @@ class AgentManager:
         :returns: The current position of the agent.
         :rtype: :class:`mas.graph.Vertex.Vertex`
         """
-        return self._agents_positions[agent]
+        return self._positions_vertices()[self._agents_index[agent]]
 
     def get_agent_position_contains_mate(self, agent):
         """Get a boolean according to whether current position of the agent 
@@ -246,7 +333,41 @@ class AgentManager:
             agent, False otherwise.
         :rtype: boolean
         """
-        return self._agents_positions_contains_mate[agent]
+        index = self._agents_index[agent]
+        if self._contains_mate_outdated:
+            self._update_positions_contains_mate()
+        return bool(self._agents_positions_contains_mate[index])
+
+    def get_agents(self, ids):
+        """Get several agents given their unique identifiers.
+
+        :param ids: Unique agent identifiers.
+        :type ids: iterable of int
+
+        :returns: The agents identified by ids, in the same order, with None
+            for the identifiers of no agent.
+        :rtype: list
+        """
+        if isinstance(ids, np.ndarray):
+            ids = ids.tolist()
+        agents = self._agents
+        index = self._ids_index.get
+        return [None if i is None else agents[i]
+                for i in map(index, ids)]
+
+    def get_agents_on_position(self, vertex):
+        """Get the agents whose position is a given vertex, in the time of a
+        vectorized scan of the positions.
+
+        :param vertex: A vertex of the topology.
+        :type vertex: :class:`mas.graph.Vertex.Vertex`
+
+        :returns: The agents on the vertex.
+        :rtype: list
+        """
+        ID = self._topology.get_vertex_id(vertex)
+        return [self._agents[index] for index in
+                np.flatnonzero(self._agents_positions == ID).tolist()]
 
     def get_agents_prior_knowledge(self):
         """Get the prior knowledge given to every agent.
@@ -256,6 +377,21 @@ class AgentManager:
         """
         return self._agents_prior_knowledge
 
+    def get_agents_with_status(self, status):
+        """Get the agents having a given status.
+
+        :param status: A status.
+        :type status: str
+
+        :returns: The agents with the given status.
+        :rtype: list
+        """
+        code = self._status_codes.get(status)
+        if code is None:
+            return []
+        return [self._agents[index] for index in
+                np.flatnonzero(self._agents_status == code).tolist()]
+
     def get_remaining_pebbles_of_agent(self, agent):
         """Get the number of pebbles of an agent.
         
@@ -276,15 +412,38 @@ class AgentManager:
         :param port: Port of the edge for the agent to traverse.
         :type port: int
         """
-        oldpos = self.get_agent_position(agent)
+        index = self._agents_index[agent]
+        vertices = self._positions_vertices()
+        oldpos = vertices[index]
         newpos = oldpos.get_neighbor_by_port(port)
-        self._set_agent_position(agent, newpos)
-
-        port_back = newpos.get_port_by_neighbor(oldpos)
-        self._set_agent_port_back(agent, port_back)
+        self._agents_positions[index] = self._topology.get_vertex_id(newpos)
+        vertices[index] = newpos
+        self._agents_port_back[index] = newpos.get_port_by_neighbor(oldpos)
 
         return oldpos, newpos
 
+    def move_agents(self, indices, positions, ports_back, step):
+        """Move several agents at once.
+
+        :param indices: Indices of the agents to move (see
+            :meth:`get_agent_index()`).
+        :type indices: numpy.array
+
+        :param positions: Identifiers of their new positions.
+        :type positions: numpy.array
+
+        :param ports_back: Ports leading back to their previous positions.
+        :type ports_back: numpy.array
+
+        :param step: Execution step of a simulation.
+        :type step: int
+        """
+        self._agents_positions[indices] = positions
+        self._agents_port_back[indices] = ports_back
+        self._agents_last_move[indices] = step
+        self._agents_vertices = None
+        self._contains_mate_outdated = True
+
     def remove_from_agent_memory(self, agent, field, value=None):
         """Remove a value from an agent's memory field.
 
@@ -314,6 +473,31 @@ class AgentManager:
         """
         pass
 
+    def reset_agent_port_back(self, agent):
+        """Forget the port the agent comes from, e.g., when the edge it
+        traversed disappears.
+
+        :param agent: A mobile agent.
+        :type agent: class:`mas.agent.Agent.Agent`
+        """
+        self._set_agent_port_back(agent, None)
+
+    def reset_ports_back(self, positions, ports):
+        """Forget the ports back of the agents on given positions that come
+        from given ports, e.g., when the edges of these ports disappear.
+
+        :param positions: Identifiers of the positions.
+        :type positions: numpy.array
+
+        :param ports: Ports back to forget, one for each position.
+        :type ports: numpy.array
+        """
+        keys = (np.asarray(positions, np.int64) << 32 |
+                np.asarray(ports, np.int64) & 0xffffffff)
+        agents_keys = (self._agents_positions.astype(np.int64) << 32 |
+                       self._agents_port_back.astype(np.int64) & 0xffffffff)
+        self._agents_port_back[np.isin(agents_keys, keys)] = self.NO_PORT
+
     def set_agent_memory(self, agent, field, value, append=False):
         """Set or add an agent's memory field (memory can not contain a field
             of same name as a field of prior knowledge).
@@ -345,7 +529,8 @@ class AgentManager:
         :param status: New status.
         :type status: str
         """
-        self._agents_status[agent] = status
+        index = self._agents_index[agent]
+        self._agents_status[index] = self._status_code(status)
 
     def update_agent_position_contains_mate(self, agent, newvalue):
         """Set the agent's field of agents_positions_contains_mate.
@@ -353,14 +538,42 @@ class AgentManager:
         :param status: New value.
         :type status: boolean
         """
-        self._agents_positions_contains_mate[agent] = newvalue
+        index = self._agents_index[agent]
+        if self._contains_mate_outdated:
+            self._update_positions_contains_mate()
+        self._agents_positions_contains_mate[index] = newvalue
+
+    def _positions_vertices(self):
+        if self._agents_vertices is None:
+            get_vertex_by_id = self._topology.get_vertex_by_id
+            self._agents_vertices = [get_vertex_by_id(ID) for ID in
+                                     self._agents_positions.tolist()]
+        return self._agents_vertices
+
+    def _read_only(self, array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
 
     def _set_agent_last_move(self, agent, step):
-        self._agents_last_move[agent] = step
+        self._agents_last_move[self._agents_index[agent]] = step
 
     def _set_agent_port_back(self, agent, port_back):
-        self._agents_port_back[agent] = port_back
-
-    def _set_agent_position(self, agent, position):
-        self._agents_positions[agent] = position
+        if port_back is None:
+            port_back = self.NO_PORT
+        self._agents_port_back[self._agents_index[agent]] = port_back
+
+    def _update_positions_contains_mate(self):
+        positions = self._agents_positions
+        counts = np.bincount(positions)
+        self._agents_positions_contains_mate[:] = counts[positions] > 1
+        self._contains_mate_outdated = False
+
+    def _status_code(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            code = len(self._statuses)
+            self._status_codes[status] = code
+            self._statuses.append(status)
+        return code
 
@@ -1,11 +1,13 @@
 #from msilib.schema import Error
 from multiprocessing.dummy import Array
 
+from contextlib import nullcontext
 from numpy import NaN, empty
 from .Agent import Agent
 from .agent_algorithms import *
 from .AgentManager import AgentManager
 from .VertexManager import VertexManager
+import numpy as np
 import random
 
 
@@ -32,7 +34,11 @@ class Simulation:
                  removable_pebbles=True,
                  async_proba=0.3,
                  initial_status="",
-                 verbose=False):
+                 verbose=False,
+                 topology_evolution=None,
+                 seed=None,
+                 kernel=None,
+                 record_encounters=False):
         """A Simulation specifying a model and a topology, executing the
         agents's algorithms, and sending requests to an AgentManager.
 
@@ -106,6 +112,37 @@ class Simulation:
             Also indicate when an agent changes its status.
             Default to False.
         :type verbose: boolean, optional
+
+        :param topology_evolution: Function called at the beginning of every
+            step with the topology and the step number, returning the edges to
+            add and to remove (see :mod:`mas.agent.topology_evolution`).
+            Default to None (static topology).
+        :type topology_evolution: function, optional
+
+        :param seed: Seed of the random generators of the simulation and of
+            its agents.
+            Default to None (unpredictable).
+        :type seed: int, optional
+
+        :param kernel: Vectorized version of the algorithm, used instead of it
+            in the synchronous model to move all the agents at once. It is
+            called at each step as ``kernel(positions, ports_back, port_table,
+            rng)`` with the identifiers of the positions of the agents, their
+            ports back (-1 for none), the port table of the topology (see
+            :meth:`mas.graph.Graph.Graph.port_table()`) and the numpy random
+            generator of the simulation. It returns, for each agent, the index
+            in the port table of the port it follows (-1 for staying still).
+            The visited vertices and edges, previous positions, vertices
+            manager and moves of the agents are brought up to date when they
+            are requested.
+            Default to None.
+        :type kernel: function, optional
+
+        :param record_encounters: Log the encounters caused by the moves of
+            the agents: every time agents enter a vertex, which then holds
+            several agents (see :meth:`get_encounters()`).
+            Default to False.
+        :type record_encounters: boolean, optional
         """
         self._topology = topology
         self._anonymous = anonymous
@@ -121,6 +158,20 @@ class Simulation:
 
         self._verbose = verbose
 
+        self._topology_evolution = topology_evolution
+
+        self._kernel = kernel
+        self._kernel_pending = False
+        self._kernel_visitors = None
+        self._kernel_edge_agents = None
+        self._kernel_edge_steps = None
+        self._kernel_moves = None
+        self._kernel_previous = None
+        self._kernel_reverse = None
+        self._kernel_reverse_version = -1
+
+        self._encounters = [] if record_encounters else None
+
         self._step = 1
 
         self._async_proba = async_proba
@@ -128,13 +179,17 @@ class Simulation:
         self._agents_list = []
         self._init_agents_list(agents_list, agents_number)
 
+        self._agents_random = dict()
+        self._init_random(seed)
+
         self._agents_manager = AgentManager(
             self._agents_list,
             topology,
             prior_knowledge=prior_knowledge,
             possible_latencies=possible_latencies,
             initial_status=initial_status,
-            number_of_pebbles=number_of_pebbles
+            number_of_pebbles=number_of_pebbles,
+            rng=self._random
         )
 
         self._vertices_manager = VertexManager(
@@ -149,6 +204,8 @@ class Simulation:
         self._verbose_introduction()
 
         self._visited_vertices = dict()
+        self._visited_vertices_number = 0
+        self._visited_vertices_mask = np.zeros(topology.order(), bool)
         self._visited_edges = dict()
         self._previous_positions = dict()
         self._init_visited_edges_and_vertices()
@@ -171,6 +228,16 @@ class Simulation:
         else:
             self._agents_list = agents_list
 
+    def _init_random(self, seed):
+        # Independent streams for the simulation and for each agent, the i-th
+        # agent of the list getting the i-th child of the agents' stream when
+        # it first asks for it.
+        self._seed_sequence = np.random.SeedSequence(seed)
+        simulation, numpy, _ = self._seed_sequence.spawn(3)
+        self._random = random.Random(
+            simulation.generate_state(1, np.uint64)[0].item())
+        self._numpy_random = np.random.default_rng(numpy)
+
     def _init_previous_positions(self):
         for agent in self._agents_list:
             pos = self._agents_manager.get_agent_position(agent)
@@ -412,6 +479,26 @@ class Simulation:
         """
         pass
 
+    def ask_for_rng(self, agent):
+        """Get the random generator of an agent.
+
+        :param agent: A mobile agent.
+        :type agent: class:`mas.agent.Agent.Agent`
+
+        :returns: The random generator of the agent.
+        :rtype: :class:`random.Random`
+        """
+        rng = self._agents_random.get(agent)
+        if rng is None:
+            index = self._agents_manager.get_agent_index(agent)
+            child = np.random.SeedSequence(
+                self._seed_sequence.entropy,
+                spawn_key=self._seed_sequence.spawn_key + (2, index),
+                pool_size=self._seed_sequence.pool_size)
+            rng = random.Random(child.generate_state(1, np.uint64)[0].item())
+            self._agents_random[agent] = rng
+        return rng
+
     def ask_for_sim_step(self):
         """Get the current step number, if possible.
 
@@ -565,10 +652,19 @@ class Simulation:
         :returns: The agent identified by id if it exists, None otherwise.
         :rtype: class:`mas.agent.Agent.Agent`
         """
-        for agent in self._agents_list:
-            if id == self._agents_manager.get_agent_id(agent):
-                return agent
-        return None
+        return self._agents_manager.get_agent_by_id(id)
+
+    def get_agents(self, ids):
+        """Get several agents given their identifiers.
+
+        :param ids: Unique agent identifiers.
+        :type ids: iterable of int
+
+        :returns: The agents identified by ids, in the same order, with None
+            for the identifiers of no agent.
+        :rtype: list
+        """
+        return self._agents_manager.get_agents(ids)
 
     def get_agents_manager(self):
         """Get the agent manager of this simulation.
@@ -584,6 +680,7 @@ class Simulation:
         :returns: All the agents in the simulation.
         :rtype: list
         """
+        self._synchronize()
         return self._agents_list
 
     def get_agent_previous_position(self, agent):
@@ -595,6 +692,7 @@ class Simulation:
         :returns: The previous position of the given agent.
         :rtype: :class:`mas.graph.Vertex.Vertex`
         """
+        self._synchronize()
         return self._previous_positions[agent]
 
     def get_async_proba(self):
@@ -607,6 +705,17 @@ class Simulation:
         """
         return self._async_proba
 
+    def get_encounters(self):
+        """Get the log of the encounters, when they are recorded.
+
+        :returns: The encounters, in chronological order, as tuples (step,
+            vertex, agents) where agents is the frozenset of the agents on the
+            vertex right after the step. None if the encounters are not
+            recorded.
+        :rtype: list
+        """
+        return self._encounters
+
     def get_step(self):
         """Get the current step number.
 
@@ -621,6 +730,7 @@ class Simulation:
         :returns: The vertices manager.
         :rtype: class:`mas.agent.VertexManager.VertexManager`
         """
+        self._synchronize()
         return self._vertices_manager
 
     def get_visited_edges(self):
@@ -630,6 +740,7 @@ class Simulation:
         :returns: A dictionnary of agents keyed by 2-sets of vertices.
         :rtype: dict
         """
+        self._synchronize()
         return self._visited_edges
 
     def get_visited_vertices(self):
@@ -639,8 +750,29 @@ class Simulation:
         :returns: A dictionnary of agents keyed by vertices.
         :rtype: dict
         """
+        self._synchronize()
         return self._visited_vertices
 
+    def get_visited_vertices_number(self):
+        """Get the number of vertices visited since the begining of the
+        simulation, in constant time.
+
+        :returns: The number of visited vertices.
+        :rtype: int
+        """
+        return self._visited_vertices_number
+
+    def get_visited_vertices_mask(self):
+        """Get which vertices have been visited since the begining of the
+        simulation, as a boolean array indexed by vertex identifiers.
+
+        :returns: A read-only view of the mask of the visited vertices.
+        :rtype: numpy.array
+        """
+        mask = self._visited_vertices_mask.view()
+        mask.flags.writeable = False
+        return mask
+
     def model(self):
         """Get all the informations about the model of the simulation.
 
@@ -671,6 +803,68 @@ class Simulation:
             "removable_pebbles": self._removable_pebbles,
         }
 
+    def numpy_rng(self):
+        """Get the numpy random generator of the simulation, for drawing many
+        numbers at once.
+
+        :returns: The numpy random generator of the simulation.
+        :rtype: :class:`numpy.random.Generator`
+        """
+        return self._numpy_random
+
+    def rng(self):
+        """Get the random generator of the simulation, which shuffles the
+        agents and drops their actions in the asynchronous model.
+
+        :returns: The random generator of the simulation.
+        :rtype: :class:`random.Random`
+        """
+        return self._random
+
+    def run(self, max_steps=None, until=None, callback=None,
+            callback_every=1):
+        """Run the simulation without any display, until a termination
+        condition holds or a number of steps have been executed.
+
+        :param max_steps: Maximum number of steps to execute.
+            Default to None (no limit).
+        :type max_steps: int, optional
+
+        :param until: A termination condition ``until(simulation)``, tested
+            before every step (see :mod:`mas.agent.termination`).
+            Default to None (run max_steps steps).
+        :type until: function, optional
+
+        :param callback: A function ``callback(simulation)`` called after
+            every callback_every steps.
+            Default to None.
+        :type callback: function, optional
+
+        :param callback_every: Number of steps between two calls of callback.
+            Default to 1.
+        :type callback_every: int, optional
+
+        :returns: The number of executed steps.
+        :rtype: int
+
+        :raises ValueError: If neither max_steps nor until is given.
+        """
+        if max_steps is None and until is None:
+            raise ValueError("run needs max_steps or a termination condition.")
+
+        steps = 0
+        step_algo = self.step_algo
+        while max_steps is None or steps < max_steps:
+            if until is not None and until(self):
+                break
+            step_algo()
+            steps += 1
+            if callback is not None and steps % callback_every == 0:
+                callback(self)
+
+        self._synchronize()
+        return steps
+
     def set_verbose(self, verbose):
         """Activate or deactivate verbose mode.
 
@@ -686,19 +880,29 @@ class Simulation:
 
     def step_algo(self):
         """Run the algorithm of every agent once, according to the model of
-        the simulation. Also increases the step number.
+        the simulation. Also increases the step number. If the topology
+        evolves, it is updated first.
         """
+        if self._topology_evolution is not None:
+            added, removed = self._topology_evolution(self._topology,
+                                                      self._step)
+            self.update_topology(added, removed)
+
+        if self._kernel is not None and self.synchronous():
+            self._kernel_step()
+            self._step += 1
+            return
 
         self._update_visited_vertices()
         if self.synchronous():
             self._init_synchronous_step_algo()
 
         if not self.synchronous():
-            random.shuffle(self._agents_list)
+            self._random.shuffle(self._agents_list)
 
         for agent in self._agents_list:
             if not self.synchronous():
-                if random.random() <= self._async_proba:
+                if self._random.random() <= self._async_proba:
                     id = self._agents_manager.get_agent_id(agent)
                     self._verbose_message(f"asynchrony prevented agent "
                                           f"{id} to apply its "
@@ -729,12 +933,93 @@ class Simulation:
         """
         return self._topology
 
+    def update_topology(self, added=(), removed=()):
+        """Add and remove edges of the topology, keeping the simulation
+        consistent: agents that came through a removed edge forget their port
+        back, and the visited edges are those of the new topology. The cost is
+        proportional to the number of edges given (and of agents at their
+        extremities). After kernel steps, the port table of the topology is
+        updated edge by edge (a copy of the table per edge) and the entries
+        the simulation recorded for it follow in a single linear pass, with
+        neither a sort of the table nor a synchronization.
+
+        :param added: Edges to add.
+            Default to ().
+        :type added: iterable of tuples of vertices, optional
+
+        :param removed: Edges to remove, before adding the new ones.
+            Default to ().
+        :type removed: iterable of tuples of vertices, optional
+        """
+        removed = list(removed)
+        added = list(added)
+        if not removed and not added:
+            return
+
+        # After kernel steps, the entries of the port table recorded by the
+        # simulation (traversed edges, reverse entries) follow the entries of
+        # the changed edges.
+        pending = self._kernel_pending
+        version = self._topology.version()
+        reverse = self._kernel_reverse_version == version
+        tracked = pending or reverse
+        if tracked:
+            previous = self._topology.port_table()
+            deleted = []
+            inserted = []
+        if pending:
+            forgotten = []
+        get_vertex_id = self._topology.get_vertex_id
+
+        # After kernel steps, the port table is needed at the next step: the
+        # topology maintains it edge by edge, whereas it would be computed
+        # again from the vertices after a batch of modifications.
+        with nullcontext() if tracked else self._topology.batch():
+            for (u, v) in removed:
+                port_u = u.get_port_by_neighbor(v)
+                port_v = v.get_port_by_neighbor(u)
+                if self._topology.remove_edge(u, v):
+                    if tracked:
+                        deleted.append((get_vertex_id(u), get_vertex_id(v)))
+                    if pending:
+                        forgotten.extend(((u, port_u), (v, port_v)))
+                    else:
+                        self._forget_port_back(u, port_u)
+                        self._forget_port_back(v, port_v)
+                    self._visited_edges.pop(frozenset({u, v}), None)
+
+            for (u, v) in added:
+                if self._topology.add_edge(u, v):
+                    if tracked:
+                        inserted.append((get_vertex_id(u), get_vertex_id(v)))
+                    self._visited_edges.setdefault(frozenset({u, v}), None)
+
+        if pending and forgotten:
+            self._agents_manager.reset_ports_back(
+                [get_vertex_id(vertex) for vertex, _ in forgotten],
+                [port for _, port in forgotten])
+        if tracked and self._topology.version() != version:
+            self._kernel_move_entries(previous, deleted, inserted, reverse)
+
     def _add_to_agents_to_move(self, agent, port):
         self._agents_to_move.append((agent, port))
 
+    def _forget_port_back(self, vertex, port):
+        for agent in self._vertices_manager.get_agents_on_vertex(vertex):
+            if self._agents_manager.get_agent_port_back(agent) == port:
+                self._agents_manager.reset_agent_port_back(agent)
+
     def _init_synchronous_step_algo(self):
         self._agents_to_move = []
 
+    def _init_kernel(self):
+        self._kernel_visitors = np.full(self._topology.order(), -1, np.int32)
+        self._kernel_moves = np.zeros(
+            len(self._agents_manager.get_all_agents()), np.int64)
+        # Latencies, unless every agent can move at every step.
+        latencies = self._agents_manager.get_all_agents_latencies()
+        self._kernel_latencies = latencies if (latencies != 1).any() else None
+
     def _is_moving_legal(self, agent, port):
         legal = True
 
@@ -761,11 +1046,145 @@ class Simulation:
 
         return legal
 
+    def _kernel_record_encounters(self, destinations):
+        # Agents on the entered vertices, grouped by vertex: only those
+        # vertices are counted, not the whole topology.
+        positions = self._agents_manager.get_all_agents_positions_ids()
+        members = np.flatnonzero(np.isin(positions, destinations))
+        members = members[np.argsort(positions[members], kind="stable")]
+        entered, starts, counts = np.unique(
+            positions[members], return_index=True, return_counts=True)
+        crowded = counts > 1
+        agents = self._agents_manager.get_all_agents()
+        vertex = self._topology.get_vertex_by_id
+        for ID, start, count in zip(entered[crowded].tolist(),
+                                    starts[crowded].tolist(),
+                                    counts[crowded].tolist()):
+            group = members[start:start + count].tolist()
+            self._encounters.append(
+                (self._step, vertex(ID), frozenset(agents[i] for i in group)))
+
+    def _kernel_move_entries(self, previous, deleted, inserted, reverse):
+        # The entries of the deleted edges were removed from the previous port
+        # table and those of the inserted edges appended to their rows, the
+        # other entries keeping their order: the entries recorded for the
+        # previous table are moved to the new one.
+        size = len(previous[1])
+        kept = np.ones(size, bool)
+        kept[self._kernel_pair_slots(previous, deleted)] = False
+        indptr, indices, _ = self._topology.port_table()
+        pairs = self._kernel_pair_slots((indptr, indices), inserted)
+        fresh = np.zeros(len(indices), bool)
+        fresh[pairs] = True
+        moved = np.full(size, -1, np.int64)
+        moved[kept] = np.flatnonzero(~fresh)
+
+        if self._kernel_pending:
+            agents = np.zeros(len(indices), np.int32)
+            steps = np.full(len(indices), -1, np.int64)
+            agents[moved[kept]] = self._kernel_edge_agents[kept]
+            steps[moved[kept]] = self._kernel_edge_steps[kept]
+            self._kernel_edge_agents = agents
+            self._kernel_edge_steps = steps
+
+        if reverse:
+            slots = np.empty(len(indices), np.int64)
+            slots[moved[kept]] = moved[self._kernel_reverse[kept]]
+            slots[pairs[:, 0]] = pairs[:, 1]
+            slots[pairs[:, 1]] = pairs[:, 0]
+            self._kernel_reverse = slots
+            self._kernel_reverse_version = self._topology.version()
+
+    def _kernel_reverse_slots(self, indptr, indices):
+        # reverse[j] is the entry of the port table for the edge of entry j
+        # followed backwards, updated when the topology changes.
+        version = self._topology.version()
+        if self._kernel_reverse_version != version:
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            self._kernel_reverse = self._kernel_slots(indptr, indices,
+                                                      indices, rows)
+            self._kernel_reverse_version = version
+        return self._kernel_reverse
+
+    def _kernel_pair_slots(self, table, edges):
+        # Entries of the given port table of the edges (i, k), as rows of
+        # pairs (entry from i to k, entry from k to i).
+        indptr, indices = table[0], table[1]
+        slots = []
+        for i, k in edges:
+            for row, column in ((i, k), (k, i)):
+                start, end = indptr[row], indptr[row + 1]
+                slots.append(start + np.flatnonzero(
+                    indices[start:end] == column)[0])
+        return np.array(slots, np.int64).reshape(-1, 2)
+
+    def _kernel_slots(self, indptr, indices, rows, columns):
+        # Entries of the port table of the edges from rows to columns, -1 for
+        # the missing ones.
+        order = len(indptr) - 1
+        if len(indices) == 0:
+            return np.full(len(rows), -1, np.int64)
+        forward = (np.repeat(np.arange(order, dtype=np.int64),
+                             np.diff(indptr)) * order + indices)
+        wanted = np.asarray(rows, np.int64) * order + columns
+        sorter = np.argsort(forward)
+        found = np.searchsorted(forward, wanted, sorter=sorter)
+        slots = sorter[np.minimum(found, len(forward) - 1)]
+        return np.where(forward[slots] == wanted, slots, -1)
+
+    def _kernel_step(self):
+        if self._kernel_visitors is None:
+            self._init_kernel()
+        manager = self._agents_manager
+        indptr, indices, ports = self._topology.port_table()
+        if (self._kernel_edge_steps is None or
+                len(self._kernel_edge_steps) != len(indices)):
+            self._kernel_edge_agents = np.zeros(len(indices), np.int32)
+            self._kernel_edge_steps = np.full(len(indices), -1, np.int64)
+
+        # Visited vertices, at the beginning of the step.
+        positions = manager.get_all_agents_positions_ids()
+        agents = np.arange(len(positions), dtype=np.int32)
+        self._kernel_visitors[positions] = agents
+        if self._visited_vertices_number < len(self._visited_vertices_mask):
+            new = positions[~self._visited_vertices_mask[positions]]
+            if len(new) != 0:
+                self._visited_vertices_mask[new] = True
+                self._visited_vertices_number += len(np.unique(new))
+        self._kernel_previous = positions.copy()
+
+        slots = np.asarray(self._kernel(positions,
+                                        manager.get_all_agents_ports_back(),
+                                        (indptr, indices, ports),
+                                        self._numpy_random))
+        moving = slots >= 0
+        if self._kernel_latencies is not None:
+            moving &= self._step % self._kernel_latencies == 0
+        if moving.all():
+            movers = slice(None)
+        else:
+            agents = agents[moving]
+            slots = slots[moving]
+            movers = agents
+
+        reverse = self._kernel_reverse_slots(indptr, indices)
+        manager.move_agents(movers, indices[slots], ports[reverse[slots]],
+                            self._step)
+
+        self._kernel_edge_agents[slots] = agents
+        self._kernel_edge_steps[slots] = self._step
+        self._kernel_moves += moving
+        self._kernel_pending = True
+
+        if self._encounters is not None:
+            self._kernel_record_encounters(indices[slots])
+
     def _move_agent(self, agent, port):
         oldpos, newpos = self._agents_manager.move_agent(agent, port)
         self._vertices_manager.move_agent(agent, oldpos, newpos)
-        self._notify_encounter_on_position(oldpos)
-        self._notify_encounter_on_position(newpos)
+        self._notify_move(agent, oldpos, newpos)
+        if self._encounters is not None:
+            self._record_encounter(newpos)
 
     def _move_multiple_agents(self, agents_with_ports):
         """Move multiple agents along given edges.
@@ -774,10 +1193,15 @@ class Simulation:
           :type agents_with_ports: list of tuples
             (class:`mas.agent.Agent.Agent`, int)
         """
+        entered = dict()
         for (agent, port) in agents_with_ports:
             oldpos, newpos = self._agents_manager.move_agent(agent, port)
             self._vertices_manager.move_agent(agent, oldpos, newpos)
-        self._notify_all_encounters()
+            self._notify_move(agent, oldpos, newpos)
+            entered[newpos] = None
+        if self._encounters is not None:
+            for vertex in entered:
+                self._record_encounter(vertex)
 
     def _notify_all_encounters(self):
         for vertex in self._vertices_manager.get_occupied_positions():
@@ -792,6 +1216,64 @@ class Simulation:
                 numerous_agents
             )
 
+    def _notify_move(self, agent, oldpos, newpos):
+        # Besides the moved agent, only the agents of a vertex whose occupancy
+        # crosses between one and two change their encounter state.
+        vertices_manager = self._vertices_manager
+        update = self._agents_manager.update_agent_position_contains_mate
+        if vertices_manager.get_occupancy(oldpos) == 1:
+            for mate in vertices_manager.get_agents_on_vertex(oldpos):
+                update(mate, False)
+        occupancy = vertices_manager.get_occupancy(newpos)
+        if occupancy == 2:
+            for mate in vertices_manager.get_agents_on_vertex(newpos):
+                update(mate, True)
+        else:
+            update(agent, occupancy > 1)
+
+    def _record_encounter(self, vertex):
+        agents_on_vertex = self._vertices_manager.get_agents_on_vertex(vertex)
+        if len(agents_on_vertex) > 1:
+            self._encounters.append(
+                (self._step, vertex, frozenset(agents_on_vertex)))
+
+    def _synchronize(self):
+        # Bring the structures left behind by kernel steps up to date.
+        if not self._kernel_pending:
+            return
+        self._kernel_pending = False
+
+        agents = self._agents_manager.get_all_agents()
+        vertex = self._topology.get_vertex_by_id
+
+        visitors = self._kernel_visitors
+        for ID in np.flatnonzero(visitors >= 0).tolist():
+            self._visited_vertices[vertex(ID)] = agents[visitors[ID]]
+        visitors[:] = -1
+
+        indptr, indices, _ = self._topology.port_table()
+        steps = self._kernel_edge_steps
+        traversers = self._kernel_edge_agents
+        slots = np.flatnonzero(steps >= 0)
+        slots = slots[np.lexsort((traversers[slots], steps[slots]))]
+        rows = np.searchsorted(indptr, slots, side="right") - 1
+        for u, v, agent in zip(rows.tolist(), indices[slots].tolist(),
+                               traversers[slots].tolist()):
+            self._visited_edges[frozenset({vertex(u), vertex(v)})] = \
+                agents[agent]
+        steps[:] = -1
+
+        for agent, ID in zip(agents, self._kernel_previous.tolist()):
+            self._previous_positions[agent] = vertex(ID)
+
+        moves = self._kernel_moves
+        for index in np.flatnonzero(moves).tolist():
+            agents[index]._moves_nb += int(moves[index])
+        moves[:] = 0
+
+        self._vertices_manager.set_agents_positions(
+            self._agents_manager.get_all_agents_positions())
+
     def _update_visited_edges(self):
         for agent in self._agents_list:
             old_pos = self._agents_manager.get_agent_position(agent)
@@ -802,6 +1284,10 @@ class Simulation:
     def _update_visited_vertices(self):
         for agent in self._agents_list:
             pos = self._agents_manager.get_agent_position(agent)
+            if self._visited_vertices[pos] is None:
+                self._visited_vertices_number += 1
+                ID = self._topology.get_vertex_id(pos)
+                self._visited_vertices_mask[ID] = True
             self._visited_vertices[pos] = agent
             self._previous_positions[agent] = pos
 
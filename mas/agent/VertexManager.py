@@ -1,4 +1,4 @@
-from collections import defaultdict
+import numpy as np
 
 
 class VertexManager:
@@ -22,19 +22,47 @@ class VertexManager:
         :type agents_positions: dict
         """
 
+        self._topology = topology
+
         self._vertices_memory = dict()
         self._init_vertices_memory(topology)
 
-        self._pos_to_agents_list = defaultdict(list)
-        self._init_pos_to_agents_list(agents_positions)
+        # Agents on each occupied vertex, as dictionnaries keyed by agents to
+        # remove them in constant time while keeping their order of arrival,
+        # and the number of agents on every vertex, indexed by identifiers.
+        # The identifiers of the occupied vertices are also grouped by number
+        # of agents, so that the most crowded ones are found without a scan.
+        self._pos_to_agents = dict()
+        self._occupancy = np.zeros(topology.order(), np.int32)
+        self._occupancy_buckets = dict()
+        self._max_occupancy = 0
+        self._init_pos_to_agents(agents_positions)
 
         self._vertices_pebbles = dict()
         self._init_vertices_pebbles(topology)
 
-    def _init_pos_to_agents_list(self, agents_positions):
+    def _change_occupancy(self, ID, delta):
+        count = self._occupancy.item(ID)
+        self._occupancy[ID] = count + delta
+        buckets = self._occupancy_buckets
+        if count != 0:
+            bucket = buckets[count]
+            bucket.remove(ID)
+            if len(bucket) == 0:
+                del buckets[count]
+                if count == self._max_occupancy and delta < 0:
+                    self._max_occupancy = count + delta
+        if count + delta != 0:
+            buckets.setdefault(count + delta, set()).add(ID)
+            self._max_occupancy = max(self._max_occupancy, count + delta)
+
+    def _init_pos_to_agents(self, agents_positions):
         for agent in agents_positions:
             vertex = agents_positions[agent]
-            self._pos_to_agents_list[vertex].append(agent)
+            self._pos_to_agents.setdefault(vertex, dict())[agent] = None
+        for vertex, agents in self._pos_to_agents.items():
+            self._change_occupancy(self._topology.get_vertex_id(vertex),
+                                   len(agents))
 
     def _init_vertices_memory(self, topology):
         for vertex in topology.vertices():
@@ -50,10 +78,35 @@ class VertexManager:
         :param vertex: A vertex.
         :type vertex: :class:`mas.graph.Vertex.Vertex`
 
-        :returns: All the agents on the given vertex.
-        :rtype: list
+        :returns: A read-only view of the agents on the given vertex, in their
+            order of arrival. The view is not to be used once agents have
+            moved.
+        :rtype: dict_keys
+        """
+        return self._pos_to_agents.get(vertex, {}).keys()
+
+    def get_most_crowded_vertices(self, number=1):
+        """Get the vertices containing the most agents.
+
+        :param number: Maximum number of vertices.
+            Default to 1.
+        :type number: int, optional
+
+        :returns: At most number occupied vertices, with their number of
+            agents, by decreasing number of agents (in no particular order for
+            equal numbers).
+        :rtype: list of tuples (:class:`mas.graph.Vertex.Vertex`, int)
         """
-        return self._pos_to_agents_list[vertex]
+        vertex = self._topology.get_vertex_by_id
+        crowded = []
+        count = self._max_occupancy
+        while count > 0 and len(crowded) < number:
+            for ID in self._occupancy_buckets.get(count, ()):
+                if len(crowded) == number:
+                    break
+                crowded.append((vertex(ID), count))
+            count -= 1
+        return crowded
 
     def get_pebbles_on_vertex(self, vertex):
         """Get all the pebbles on a vertex.
@@ -90,7 +143,29 @@ class VertexManager:
         :return: A list of vertices.
         :rtype: list
         """
-        return list(self._pos_to_agents_list)
+        return list(self._pos_to_agents)
+
+    def get_occupancy(self, vertex):
+        """Get the number of agents on a vertex.
+
+        :param vertex: A vertex.
+        :type vertex: :class:`mas.graph.Vertex.Vertex`
+
+        :returns: The number of agents on the given vertex.
+        :rtype: int
+        """
+        return len(self._pos_to_agents.get(vertex, ()))
+
+    def get_occupancy_vector(self):
+        """Get the number of agents on every vertex.
+
+        :returns: A read-only view of the numbers of agents, indexed by vertex
+            identifiers.
+        :rtype: numpy.array
+        """
+        occupancy = self._occupancy.view()
+        occupancy.flags.writeable = False
+        return occupancy
 
     def get_vertex_memory(self, vertex, field=None):
         """Get a vertex's memory.
@@ -128,13 +203,18 @@ class VertexManager:
         :param port: Port of the edge for the agent to traverse.
         :type port: int
         """
-        if agent not in self._pos_to_agents_list[oldpos]:
+        agents = self._pos_to_agents.get(oldpos)
+        if agents is None or agent not in agents:
             return False
 
-        self._pos_to_agents_list[oldpos].remove(agent)
-        self._pos_to_agents_list[newpos].append(agent)
-        if len(self._pos_to_agents_list[oldpos]) == 0:
-            del(self._pos_to_agents_list[oldpos])
+        del agents[agent]
+        if len(agents) == 0:
+            del self._pos_to_agents[oldpos]
+        self._pos_to_agents.setdefault(newpos, dict())[agent] = None
+
+        get_vertex_id = self._topology.get_vertex_id
+        self._change_occupancy(get_vertex_id(oldpos), -1)
+        self._change_occupancy(get_vertex_id(newpos), 1)
         return True
 
     def remove_agent_pebble_from_vertex(self, agent, vertex):
@@ -152,6 +232,21 @@ class VertexManager:
         """
         pass
 
+    def set_agents_positions(self, agents_positions):
+        """Replace the positions of all the agents, e.g., after they were moved
+        all at once.
+
+        :param agents_positions: Dictionnary of vertices
+          (:class:`mas.graph.Vertex.Vertex`) keyed by agents
+          (:class:`mas.agent.Agent.Agent`).
+        :type agents_positions: dict
+        """
+        self._pos_to_agents = dict()
+        self._occupancy[:] = 0
+        self._occupancy_buckets = dict()
+        self._max_occupancy = 0
+        self._init_pos_to_agents(agents_positions)
+
     def set_vertex_memory(self, vertex, field, value, append=False):
         """Set or add a vertex's memory field.
 
@@ -11,6 +11,12 @@ Module classes
     * :class:`mas.agent.Simulation.Simulation`
     * :class:`mas.agent.VertexManager.VertexManager`
 
+Module functions
+----------------
+
+    * :mod:`mas.agent.termination`
+    * :mod:`mas.agent.topology_evolution`
+
 Module content
 --------------
 
@@ -31,6 +37,12 @@ Module content
     :members:
     :special-members: __init__    
 
+.. automodule:: mas.agent.termination
+    :members:
+
+.. automodule:: mas.agent.topology_evolution
+    :members:
+
 """
 
 __author__ = 'Sébastien Ratel'
@@ -39,5 +51,7 @@ __all__ = [
     "Agent",
     "Simulation",
     "AgentManager",
-    "VertexManager"
+    "VertexManager",
+    "termination",
+    "topology_evolution"
 ]
@@ -1,11 +1,27 @@
-import random
 import math
+import numpy as np
 
 from numpy import size
 
 def nothing(agent):
     return
 
+def random_walk(agent):
+    ports = agent.available_ports()
+    if ports:
+        agent.move_along(agent.rng().choice(ports))
+
+def random_walk_kernel(positions, ports_back, port_table, rng):
+    """Vectorized version of :func:`random_walk` (see the kernel parameter of
+    :class:`mas.agent.Simulation.Simulation`): every agent follows a port
+    drawn uniformly among those of its position.
+    """
+    indptr = port_table[0]
+    starts = indptr[positions]
+    degrees = indptr[positions + 1] - starts
+    slots = starts + rng.integers(np.maximum(degrees, 1))
+    return np.where(degrees > 0, slots, -1)
+
 def marche_alea(agent):
     #print("Agent n°",agent.get_id())
     #print("\tStatus:",agent.status())
@@ -15,7 +31,7 @@ def marche_alea(agent):
     #if (agent.get_position_id() not in agent.read_memory_field("visited")):
     if size(agent.read_memory_field("visited"))<10:
         agent.write_on_memory_field("visited", agent.get_position_id(),True)
-        agent.move_along(random.choice(ports))
+        agent.move_along(agent.rng().choice(ports))
         #print("\t",ports) 
         #print("\t",agent.get_sim_step()) 
         print("Memoire",agent.read_memory_field("visited"))
@@ -28,7 +44,7 @@ def marche_alea2(agent):
     print("\tStatus:",agent.status())
     ports=agent.available_ports()
     print("Noeud",agent.get_position_id())
-    agent.move_along(random.choice(ports))
+    agent.move_along(agent.rng().choice(ports))
     print("\t",ports) 
 
 
@@ -44,12 +60,12 @@ def mdm(agent):
             agent.move_along(precedent)
             agent.leave_pebble()
         else:
-            choice=random.choice(ports)
+            choice=agent.rng().choice(ports)
             agent.write_on_memory_field("visited", choice,True)
             agent.move_along(choice)
             agent.leave_pebble()
     else:
-        choice=random.choice(ports)
+        choice=agent.rng().choice(ports)
         agent.write_on_memory_field("visited", choice,True)
         agent.move_along(choice)
         agent.leave_pebble()
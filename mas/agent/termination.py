@@ -0,0 +1,85 @@
+"""Termination conditions of simulations.
+
+A termination condition is a predicate ``condition(simulation)`` evaluated by
+:meth:`mas.agent.Simulation.Simulation.run()` before every step: the
+simulation stops as soon as it returns True. The predicates below only look at
+the agents (or at the counters maintained by the simulation), so that they can
+be evaluated at every step of long simulations.
+"""
+
+import numpy as np
+
+
+def all_agents_met(simulation):
+    """Test whether all the agents are on the same vertex.
+
+    :param simulation: A simulation.
+    :type simulation: :class:`mas.agent.Simulation.Simulation`
+
+    :returns: True if the agents are gathered on a single vertex, False
+        otherwise.
+    :rtype: boolean
+    """
+    positions = simulation.get_agents_manager().get_all_agents_positions_ids()
+    return bool((positions == positions[:1]).all())
+
+
+def all_agents_with_status(status="done"):
+    """Build a predicate testing whether every agent has a given status.
+
+    :param status: The status of terminated agents.
+        Default to "done".
+    :type status: string, optional
+
+    :returns: The termination condition.
+    :rtype: function
+    """
+    def condition(simulation):
+        manager = simulation.get_agents_manager()
+        return (len(manager.get_agents_with_status(status)) ==
+                len(manager.get_all_agents_positions_ids()))
+
+    return condition
+
+
+def all_vertices_visited(simulation):
+    """Test whether every vertex of the topology has been visited, including
+    the current positions of the agents.
+
+    :param simulation: A simulation.
+    :type simulation: :class:`mas.agent.Simulation.Simulation`
+
+    :returns: True if every vertex has been visited, False otherwise.
+    :rtype: boolean
+    """
+    missing = (simulation.topology().order() -
+               simulation.get_visited_vertices_number())
+    positions = simulation.get_agents_manager().get_all_agents_positions_ids()
+    if missing > len(positions):
+        return False
+
+    unvisited = positions[~simulation.get_visited_vertices_mask()[positions]]
+    return len(np.unique(unvisited)) == missing
+
+
+def any_of(*conditions):
+    """Build a predicate true as soon as one of the given ones is.
+
+    :param conditions: Termination conditions.
+    :type conditions: functions
+
+    :returns: The termination condition.
+    :rtype: function
+    """
+    def condition(simulation):
+        return any(predicate(simulation) for predicate in conditions)
+
+    return condition
+
+
+# Termination conditions keyed by their names in mas-run and experiments.
+CONDITIONS = {
+    "visited": all_vertices_visited,
+    "met": all_agents_met,
+    "done": all_agents_with_status("done"),
+}
@@ -0,0 +1,176 @@
+"""Evolutions of the topology of a simulation over time.
+
+A topology evolution is a function called by
+:meth:`mas.agent.Simulation.Simulation.step_algo()` at the beginning of every
+step, before the agents act. It is given the topology and the step number,
+and returns the edges (couples of vertices) to add and to remove::
+
+    added, removed = evolution(topology, step)
+
+Only the edges that change are returned, so that the cost of a step is
+proportional to the number of changes. The functions below build evolutions
+acting on a given set of edges, the *footprint*, usually the edges of the
+initial topology; the other edges of the topology are left untouched. The
+edges of the footprint are all present before the first call.
+"""
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
+
+
+def periodic(edges, period, phases=None):
+    """Edges present one step out of ``period``.
+
+    :param edges: The footprint.
+    :type edges: list of tuples
+
+    :param period: Number of steps between two appearances of an edge.
+    :type period: int
+
+    :param phases: The i-th edge is present at the steps t such that
+        ``t % period == phases[i]``.
+        Default to None (every edge present at steps multiple of period).
+    :type phases: list of int, optional
+
+    :returns: The topology evolution.
+    :rtype: function
+    """
+    edges = list(edges)
+    if phases is None:
+        phases = [0] * len(edges)
+
+    # Edges appearing and disappearing at each residue of the step.
+    appearing = [[] for _ in range(period)]
+    for edge, phase in zip(edges, phases):
+        appearing[phase % period].append(edge)
+    disappearing = appearing[-1:] + appearing[:-1]
+
+    first = True
+
+    def evolution(topology, step):
+        nonlocal first
+        r = step % period
+        if first:
+            first = False
+            present = set(appearing[r])
+            return [], [edge for edge in edges if edge not in present]
+        if period == 1:
+            return [], []
+        return appearing[r], disappearing[r]
+
+    return evolution
+
+
+def random_churn(edges, appearance, disappearance, seed=None):
+    """Edges appearing and disappearing at random: at each step, every absent
+    edge of the footprint appears with a given probability, and every present
+    one disappears with an other one. Every edge is present initially.
+
+    :param edges: The footprint.
+    :type edges: list of tuples
+
+    :param appearance: Probability for an absent edge to appear.
+    :type appearance: float
+
+    :param disappearance: Probability for a present edge to disappear.
+    :type disappearance: float
+
+    :param seed: Seed of the random generator.
+        Default to None.
+    :type seed: int, optional
+
+    :returns: The topology evolution.
+    :rtype: function
+    """
+    rng = np.random.default_rng(seed)
+
+    # Present and absent edges, as lists from which an edge is removed in
+    # constant time by swapping it with the last one.
+    present = list(edges)
+    absent = []
+
+    def take(candidates, probability):
+        count = rng.binomial(len(candidates), probability)
+        taken = []
+        for i in sorted(rng.choice(len(candidates), count, replace=False),
+                        reverse=True):
+            candidates[i], candidates[-1] = candidates[-1], candidates[i]
+            taken.append(candidates.pop())
+        return taken
+
+    def evolution(topology, step):
+        added = take(absent, appearance)
+        removed = take(present, disappearance)
+        present.extend(added)
+        absent.extend(removed)
+        return added, removed
+
+    return evolution
+
+
+def t_interval_connected(edges, T, seed=None):
+    """A T-interval connected evolution: the edges present during any T
+    consecutive steps contain a common spanning tree of the footprint.
+
+    Every T steps, a new random spanning tree of the footprint appears, and
+    the one that appeared 2T steps earlier disappears, so that only the edges
+    of the two most recent trees are present.
+
+    :param edges: The footprint, a connected graph.
+    :type edges: list of tuples
+
+    :param T: Number of steps during which a spanning tree remains.
+    :type T: int
+
+    :param seed: Seed of the random generator.
+        Default to None.
+    :type seed: int, optional
+
+    :returns: The topology evolution.
+    :rtype: function
+    """
+    edges = list(edges)
+    rng = np.random.default_rng(seed)
+
+    IDs = dict()
+    for u, v in edges:
+        IDs.setdefault(u, len(IDs))
+        IDs.setdefault(v, len(IDs))
+    src = np.array([IDs[u] for u, _ in edges], dtype=int)
+    dst = np.array([IDs[v] for _, v in edges], dtype=int)
+    index = {(i, k): e
+             for e, (i, k) in enumerate(zip(src.tolist(), dst.tolist()))}
+
+    def spanning_tree():
+        # Minimum spanning tree for random weights.
+        weights = rng.random(len(edges)) + 1
+        tree = minimum_spanning_tree(
+            coo_matrix((weights, (src, dst)), shape=(len(IDs), len(IDs)))
+        ).tocoo()
+        return {index.get((i, k), index.get((k, i)))
+                for i, k in zip(tree.row.tolist(), tree.col.tolist())}
+
+    trees = []
+    first = True
+
+    def evolution(topology, step):
+        nonlocal first
+        if first:
+            first = False
+            trees.append(spanning_tree())
+            return [], [edges[e] for e in range(len(edges))
+                        if e not in trees[0]]
+
+        if step % T != 0:
+            return [], []
+
+        present = set().union(*trees)
+        trees.append(spanning_tree())
+        old = trees.pop(0) if len(trees) > 2 else set()
+        kept = set().union(*trees)
+        added = [edges[e] for e in kept - present]
+        removed = [edges[e] for e in old - kept]
+        return added, removed
+
+    return evolution
@@ -0,0 +1,188 @@
+"""Monte Carlo experiments: many independent simulations run in parallel.
+
+An experiment runs every configuration of a parameter grid several times,
+each run with its own seed, over a pool of processes. For example::
+
+    from mas.experiment import parameter_grid, run_experiment
+
+    grid = parameter_grid(topology="grid", size=[(5, 5), (10, 10)],
+                          agents_number=[1, 2, 4], algorithm="random_walk")
+    result = run_experiment(grid, repetitions=100, seed=0)
+    result["cover_time"].mean()
+
+A configuration is a dictionary with the keys:
+
+* ``"topology"``: name of a function of :mod:`mas.graph.graph_generator`;
+
+* ``"size"``: argument (or tuple of arguments) of the generator;
+
+* ``"algorithm"``: name of a function of :mod:`mas.agent.agent_algorithms`,
+  or any function that can be pickled (default: ``"random_walk"``);
+
+* ``"kernel"``: vectorized version of the algorithm, given in the same way
+  (default: None);
+
+* any other keyword argument of :class:`mas.agent.Simulation.Simulation`,
+  such as ``"agents_number"`` or ``"synchronous"``.
+
+The seeds of the runs are drawn from a single
+:class:`numpy.random.SeedSequence`, so that the result only depends on the
+seed of the experiment, and not on the number of processes.
+"""
+
+from mas.agent import agent_algorithms, termination
+from mas.agent.Simulation import Simulation
+from mas.graph import graph_generator
+
+from concurrent.futures import ProcessPoolExecutor
+import inspect
+import itertools
+import numpy as np
+import os
+import random
+
+METRICS = ("steps", "moves", "cover_time", "meeting_time")
+
+
+def parameter_grid(**axes):
+    """Build the configurations of a parameter grid.
+
+    :param axes: Parameters of the configurations. A list gives the values
+        taken by a parameter, any other value (including a tuple) is common to
+        all the configurations.
+    :type axes: any
+
+    :returns: The configurations, one for each combination of the values of
+        the parameters.
+    :rtype: list of dict
+    """
+    names = list(axes)
+    values = [axes[name] if isinstance(axes[name], list) else [axes[name]]
+              for name in names]
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values)]
+
+
+def run_experiment(configurations, repetitions=1, until="visited",
+                   max_steps=None, seed=None, workers=None):
+    """Run every configuration several times and gather the metrics of the
+    runs: the number of steps, the total number of moves of the agents, the
+    cover time (first step at which every vertex has been visited) and the
+    meeting time (first step at which all the agents are on the same vertex).
+
+    :param configurations: The configurations to run (see
+        :func:`parameter_grid()`).
+    :type configurations: list of dict
+
+    :param repetitions: Number of runs of each configuration.
+        Default to 1.
+    :type repetitions: int, optional
+
+    :param until: Termination condition of the runs: "visited", "met" or
+        "done" (every agent has status "done").
+        Default to "visited".
+    :type until: string, optional
+
+    :param max_steps: Maximum number of steps of a run.
+        Default to None (no limit).
+    :type max_steps: int, optional
+
+    :param seed: Seed of the experiment.
+        Default to None.
+    :type seed: int, optional
+
+    :param workers: Number of processes. With 0, the runs are executed in the
+        current process.
+        Default to None (number of processors).
+    :type workers: int, optional
+
+    :returns: The result table, as columns keyed by their names: one column
+        for each parameter, the ``"repetition"`` and ``"seed"`` of the run,
+        then the metrics. A time that was not reached is -1.
+    :rtype: dict of numpy.array
+    """
+    tasks = [(configuration, repetition)
+             for configuration in configurations
+             for repetition in range(repetitions)]
+    seeds = [int(child.generate_state(1)[0])
+             for child in np.random.SeedSequence(seed).spawn(len(tasks))]
+    tasks = [(configuration, task_seed, until, max_steps)
+             for (configuration, _), task_seed in zip(tasks, seeds)]
+
+    if workers == 0:
+        metrics = list(map(_run_task, tasks))
+    else:
+        workers = workers or os.cpu_count()
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(workers) as executor:
+            metrics = list(executor.map(_run_task, tasks,
+                                        chunksize=chunksize))
+
+    names = []
+    for configuration in configurations:
+        names.extend(name for name in configuration if name not in names)
+
+    columns = {name: _column([configuration.get(name)
+                              for configuration, _, _, _ in tasks])
+               for name in names}
+    columns["repetition"] = np.tile(np.arange(repetitions),
+                                    len(configurations))
+    columns["seed"] = np.array(seeds, dtype=np.uint32)
+    for i, metric in enumerate(METRICS):
+        columns[metric] = np.array([run[i] for run in metrics], dtype=int)
+    return columns
+
+
+def _column(values):
+    if all(isinstance(value, (bool, int, float)) for value in values):
+        return np.array(values)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _run_task(task):
+    configuration, seed, until, max_steps = task
+    configuration = dict(configuration)
+    random.seed(seed)
+
+    generator = getattr(graph_generator, configuration.pop("topology"))
+    size = configuration.pop("size", ())
+    if not isinstance(size, tuple):
+        size = (size,)
+    keywords = dict()
+    if "seed" in inspect.signature(generator).parameters:
+        keywords["seed"] = seed
+    topology = generator(*size, **keywords)
+
+    algorithm = configuration.pop("algorithm", "random_walk")
+    if isinstance(algorithm, str):
+        algorithm = getattr(agent_algorithms, algorithm)
+    if isinstance(configuration.get("kernel"), str):
+        configuration["kernel"] = getattr(agent_algorithms,
+                                          configuration["kernel"])
+
+    configuration.setdefault("seed", seed)
+    simulation = Simulation(topology, algorithm=algorithm, **configuration)
+
+    times = {"cover_time": -1, "meeting_time": -1}
+
+    def record(simulation, steps):
+        if (times["cover_time"] < 0 and
+                termination.all_vertices_visited(simulation)):
+            times["cover_time"] = steps
+        if (times["meeting_time"] < 0 and
+                termination.all_agents_met(simulation)):
+            times["meeting_time"] = steps
+
+    record(simulation, 0)
+    first_step = simulation.get_step()
+    steps = simulation.run(
+        max_steps=max_steps,
+        until=termination.CONDITIONS[until],
+        callback=lambda simulation: record(
+            simulation, simulation.get_step() - first_step)
+    )
+
+    moves = sum(agent.get_moves_nb() for agent in simulation.get_all_agents())
+    return steps, moves, times["cover_time"], times["meeting_time"]
@@ -1,6 +1,13 @@
+from . import binary_format
 from .Vertex import Vertex
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import numpy as np
 import networkx as nx
+import os
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, shortest_path
 
 
 class Graph:
@@ -8,6 +15,13 @@ class Graph:
 
     INFTY = 9999
 
+    DISTANCE_CACHE_BUDGET = 2**26
+
+    _DISTANCE_CHUNK_CELLS = 2**22
+    _PROGRESS_LINES = 2**16
+    _TABLE_CHUNK = 2**16
+    _WRITE_BUFFER = 2**20
+
     def __init__(self):
         """A graph.
         """
@@ -18,18 +32,43 @@ class Graph:
         self._type = "unknown"
 
         self._adjacency_matrix_computed = False
+        self._csr_computed = False
         self._distance_matrix_computed = False
-        self._is_planar_computed = False
         self._is_connected_computed = False
-        self._distance_matrix = np.empty(0, float)
+        self._distance_matrix = np.empty((0, 0), np.int16)
         self._adjacency_matrix = np.empty(0, int)
+        self._indptr = np.zeros(1, np.int32)
+        self._indices = np.empty(0, np.int32)
+        self._ports = np.empty(0, np.int32)
         self._is_planar = False
+        self._is_planar_version = -1
         self._is_connected = False
 
+        self._distance_rows = OrderedDict()
+        self._distance_rows_nbytes = 0
+        self._distance_cache_budget = self.DISTANCE_CACHE_BUDGET
+
+        self._components_label = []
+        self._components = {}
+        self._components_next_label = 0
+
+        self._cache_statistics = {
+            cache: {"rebuilds": 0, "avoided_rebuilds": 0}
+            for cache in ("adjacency", "distances", "connectivity",
+                          "planarity")
+        }
+
+        # Edges keep the orientation they were added with; the index finds
+        # them from the identifiers of their extremities, in any order.
         self._edges = set()
+        self._edgeIndex = dict()
 
         self._diameter = 0
         self._order = 0
+        self._version = 0
+
+        self._batch_depth = 0
+        self._batch_modified = False
 
     def add_edge(self, u, v):
         """Add an (undirected) edge to the graph.
@@ -60,7 +99,9 @@ class Graph:
         success = success1 and success2
         if success:
             self._edges.add((u, v))
-            self._untoggle_computed()
+            key = self._edge_key(self._vertexToID[u], self._vertexToID[v])
+            self._edgeIndex[key] = (u, v)
+            self._update_computed_after_edge_insertion(u, v)
 
         return success
 
@@ -81,13 +122,18 @@ class Graph:
             self._nameToVertex[vertex.name()] = vertex
 
             self._order += 1
-            self._untoggle_computed()
+            if len(vertex.get_neighbors()) == 0:
+                self._update_computed_after_vertex_insertion()
+            else:
+                self._untoggle_computed()
             return True
         return False
 
     def adjacency_matrix(self):
-        """Compute (if needed) and get the adjacency matrix
-        of the graph.
+        """Compute (if needed) and get the dense adjacency matrix
+        of the graph. The graph is stored as a sparse matrix (see
+        :meth:`sparse_adjacency()`), so this quadratic export is only built
+        on request.
 
         :returns: The adjacency matrix of the graph.
         :rtype: numpy.array
@@ -96,10 +142,81 @@ class Graph:
         self._compute_adjacency_matrix()
         return self._adjacency_matrix
 
+    @contextmanager
+    def batch(self):
+        """Context in which the graph can be modified many times for the price
+        of a single one::
+
+            with graph.batch():
+                for u, v in new_edges:
+                    graph.add_edge(u, v)
+
+        Inside the context, modifications invalidate the computed matrices
+        instead of maintaining them, so that they are computed again (at most)
+        once when needed. Subclasses are notified of the modifications once, at
+        the end of the outermost context.
+
+        :returns: A context manager giving the graph itself.
+        :rtype: contextmanager
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth = max(self._batch_depth - 1, 0)
+            if self._batch_depth == 0 and self._batch_modified:
+                self._batch_modified = False
+                self._modified()
+
+    def cache_statistics(self):
+        """Get, for every structure cached by the graph, how many times it was
+        entirely rebuilt and how many times a mutation of the graph updated it
+        in place instead of invalidating it.
+
+        :returns: Dictionaries with keys "rebuilds" and "avoided_rebuilds",
+            keyed by "adjacency", "distances", "connectivity" and "planarity".
+        :rtype: dict
+        """
+        return {
+            cache: dict(counters)
+            for cache, counters in self._cache_statistics.items()
+        }
+
+    def component_of(self, vertex):
+        """Get the connected component containing a vertex.
+
+        The returned set is shared with the graph and must not be modified.
+
+        :param vertex: Vertex whose component is wanted.
+        :type vertex: Vertex
+
+        :returns: The vertices of the connected component of vertex, None if \
+        vertex is not in the graph.
+        :rtype: set
+        """
+        if vertex not in self._vertexToID:
+            return None
+        self._compute_is_connected()
+        return self._components[self._find_component(self._vertexToID[vertex])]
+
+    def connected_components(self):
+        """Get the connected components of the graph.
+
+        Components are computed once, then kept up to date by edge and vertex
+        insertions and by edge removals. The returned sets are shared with
+        the graph and must not be modified.
+
+        :returns: The vertex sets of the connected components of the graph.
+        :rtype: list
+        """
+        self._compute_is_connected()
+        return list(self._components.values())
+
     def diameter(self):
         """Get the maximum distance between two vertices.
 
-        :returns: The diameter of the graph.
+        :returns: The diameter of the graph (``Graph.INFTY`` if the graph is
+            not connected).
         :rtype: int
         """
         if (not self._distance_matrix_computed):
@@ -116,18 +233,53 @@ class Graph:
         :param v: Any vertex of the graph.
         :type v: :class:`mas.graph.Vertex.Vertex`
 
-        :returns: The distance between the u and v.
+        :returns: The distance between the u and v. Unless the whole
+            distance matrix was already computed, only the distances from u
+            are computed (and cached, see :meth:`distances_from()`).
         :rtype: int
         """
-        self._compute_distance_matrix()
-        i = self._vertexToID[u]
         k = self._vertexToID[v]
-        return self._distance_matrix[i, k]
+        return self.distances_from(u)[k]
+
+    def distances_from(self, u):
+        """Get the distances from a vertex to every vertex of the graph.
+
+        The distances are computed by a single BFS from u on first query and
+        kept in a least-recently-used cache whose memory footprint is bounded
+        by :meth:`set_distance_cache_budget()`, so that repeated queries from a
+        few sources never materialize the whole distance matrix.
+
+        :param u: Any vertex of the graph.
+        :type u: :class:`mas.graph.Vertex.Vertex`
+
+        :returns: The distances from u, indexed by the identifiers of the
+            vertices (see :meth:`get_vertex_id()`). Vertices that can not be
+            reached from u are at distance ``Graph.INFTY``.
+        :rtype: numpy.array
+            (https://numpy.org/doc/stable/reference/generated/numpy.array.html)
+        """
+        i = self._vertexToID[u]
+        if self._distance_matrix_computed:
+            return self._distance_matrix[i]
+
+        row = self._distance_rows.get(i)
+        if row is None:
+            self._compute_csr()
+            row = self._compute_distance_rows(np.array([i]))[0]
+            row.flags.writeable = False
+            self._distance_rows[i] = row
+            self._distance_rows_nbytes += row.nbytes
+            self._evict_distance_rows()
+        else:
+            self._distance_rows.move_to_end(i)
+        return row
 
     def distance_matrix(self):
-        """Get the distance matrix of the graph.
+        """Get the distance matrix of the graph. Two vertices lying in
+        different connected components are at distance ``Graph.INFTY``.
 
-        :returns: The distance matrix of the graph.
+        :returns: The distance matrix of the graph, stored with the smallest
+            integer dtype able to hold every distance.
         :rtype: numpy.array
             (https://numpy.org/doc/stable/reference/generated/numpy.array.html)
         """
@@ -142,6 +294,44 @@ class Graph:
         """
         return self._edges
 
+    @classmethod
+    def from_edge_arrays(cls, n, src, dst, ports=None, names=None):
+        """Build a graph from arrays of edges, in a single pass and without
+        any per-edge membership test or cache invalidation. Vertices get the
+        identifiers 0, ..., n-1 (see :meth:`get_vertex_id()`).
+
+        Unless ports are given, every vertex numbers its ports 0, 1, ... in
+        the order its edges appear in the arrays, exactly as if the edges were
+        added one after the other with :meth:`add_edge()`. Loops and repeated
+        edges are ignored.
+
+        :param n: Number of vertices.
+        :type n: int
+
+        :param src: First extremities of the edges, as identifiers.
+        :type src: numpy.array or list of int
+
+        :param dst: Second extremities of the edges, as identifiers.
+        :type dst: numpy.array or list of int
+
+        :param ports: Pair of arrays ``(src_ports, dst_ports)`` such that edge
+            e is reached by port ``src_ports[e]`` from ``src[e]`` and by port
+            ``dst_ports[e]`` from ``dst[e]``. Ports skipped by a vertex can be
+            used by its later neighbors.
+            Default to None.
+        :type ports: tuple, optional
+
+        :param names: Names of the vertices, in identifier order.
+            Default to None (vertex of identifier i is named i).
+        :type names: list, optional
+
+        :returns: The graph.
+        :rtype: :class:`mas.graph.Graph.Graph`
+        """
+        graph = cls()
+        graph._init_from_edge_arrays(n, src, dst, ports=ports, names=names)
+        return graph
+
     def get_vertex_by_id(self, ID):
         """Get the vertex uniquely associated to an identifier.
 
@@ -206,14 +396,37 @@ class Graph:
         self._adjacency_matrix = adjacency_matrix.copy()
         self._adjacency_matrix_computed = True
 
-    def init_from_file(self, filename):
+    def init_from_binary_file(self, filename):
+        """Initialize the graph from a file written by :meth:`save_binary()`.
+        Identifiers, names, ports, the order of the neighbors of every vertex
+        and the type of the graph are restored, as well as its distance matrix
+        if it was saved.
+
+        :param filename: Name of the file to open.
+        :type filename: string
+
+        :raises ValueError: If the file is not a binary graph file.
+        """
+        content = binary_format.read(filename)
+        self.__init__()
+        self._init_from_port_table(content["indptr"], content["indices"],
+                                   content["ports"], content["names"])
+        self._type = content["type"]
+
+        distances = content["distances"]
+        if distances is not None:
+            self._distance_matrix = distances.astype(self._distance_dtype())
+            self._diameter = int(distances.max(initial=0))
+            self._distance_matrix_computed = True
+
+    def init_from_file(self, filename, progress=None):
         """Initialize the graph from a file in which:
 
         * the first line contains a list of names of vertices separated by\
-            spaces;
+            whitespaces;
 
         * the following lines contain adjacency lists of vertices separated by\
-            spaces, and where:
+            whitespaces, and where:
 
             - the first name is the name of the vertex whose line is the\
                 adjacency list;
@@ -222,36 +435,58 @@ class Graph:
 
         The graph is supposed to be undirected, i.e., if a vertex u belongs to
         the adjacency list of an other vertex v, then v will also be linked to
-        u.
+        u. Names that are not on the first line are ignored.
+
+        The file is read line by line and the edges are stored in compact
+        arrays before the graph is built in bulk (see
+        :meth:`from_edge_arrays()`), so that large files can be loaded.
 
         :param filename: Name of the file to open.
         :type filename: string
-        """
-        def removeln(str):
-            if str[-1] == "\n":
-                str = str[:-1]
-            return str
 
-        with open(filename) as file:
-            lines = file.readlines()
+        :param progress: Function called regularly while reading the file, with
+            the number of bytes read so far and the size of the file.
+            Default to None.
+        :type progress: callable, optional
+        """
+        total = os.path.getsize(filename)
+        src = array("q")
+        dst = array("q")
+
+        with open(filename, "rb") as file:
+            first = file.readline()
+            read = len(first)
+            names = first.split()
+            nameToID = {name: i for i, name in enumerate(names)}
+
+            for number, line in enumerate(file):
+                read += len(line)
+                adjList = line.split()
+                if len(adjList) != 0 and adjList[0] in nameToID:
+                    i = nameToID[adjList[0]]
+                    for name in adjList[1:]:
+                        k = nameToID.get(name)
+                        if k is not None:
+                            src.append(i)
+                            dst.append(k)
+                if progress is not None and number % self._PROGRESS_LINES == 0:
+                    progress(read, total)
+
+        if progress is not None:
+            progress(total, total)
 
         self.__init__()
-
-        verticesData = lines[0].split(" ")
-        verticesData[-1] = removeln(verticesData[-1])
-
-        for v in verticesData:
-            self.add_vertex(Vertex(v))
-
-        for line in lines[1:]:
-            adjList = line.split(" ")
-            vertex = self.get_vertex_by_name(removeln(adjList[0]))
-            for v in adjList[1:]:
-                neighbor = self.get_vertex_by_name(removeln(v))
-                self.add_edge(vertex, neighbor)
+        self._init_from_edge_arrays(len(names),
+                                    np.frombuffer(src, dtype=np.int64),
+                                    np.frombuffer(dst, dtype=np.int64),
+                                    names=[name.decode() for name in names])
 
     def init_from_graph(self, graph, copy=True):
-        """Become a copy of the given graph.
+        """Become a copy of the given graph, in linear time.
+
+        Vertices keep their identifiers, and the ports of every vertex are
+        copied exactly. Matrices already computed for ``graph`` are shared with
+        the copy until one of them is modified.
 
         :param graph: The graph to copy.
         :type graph: :class:`mas.graph.Graph.Graph`
@@ -264,19 +499,33 @@ class Graph:
         :type copy: :class:`mas.graph.Graph.Graph`
         """
         self.__init__()
-
-        for vertex in graph.vertices():
-            if copy:
-                self.add_vertex(Vertex(vertex.name()))
-            else: 
-                self.add_vertex(vertex)
-
-        for edge in graph.edges():
-            nameU = edge[0].name()
-            nameV = edge[1].name()
-            u = self.get_vertex_by_name(nameU)
-            v = self.get_vertex_by_name(nameV)
-            self.add_edge(u, v)
+        self._type = graph.type()
+
+        if copy:
+            image = {vertex: Vertex(vertex.name())
+                     for vertex in graph.vertices()}
+            for vertex, clone in image.items():
+                clone._copy_ports(vertex, image)
+            self._vertexToID = {
+                image[vertex]: ID for vertex, ID in graph.vertices().items()
+            }
+            self._edges = {(image[u], image[v]) for u, v in graph.edges()}
+        else:
+            self._vertexToID = dict(graph.vertices())
+            self._edges = set(graph.edges())
+
+        self._IDToVertex = {ID: vertex
+                            for vertex, ID in self._vertexToID.items()}
+        self._nameToVertex = {vertex.name(): vertex
+                              for vertex in self._vertexToID}
+        self._order = len(self._vertexToID)
+        self._edgeIndex = {
+            self._edge_key(self._vertexToID[u], self._vertexToID[v]): (u, v)
+            for u, v in self._edges
+        }
+
+        if isinstance(graph, Graph):
+            self._share_computed(graph)
 
     def is_connected(self):
         """ Connexity test of the graph.
@@ -304,6 +553,24 @@ class Graph:
         """
         return self._order
 
+    def port_table(self):
+        """Compute (if needed) and get the port numbering of the whole graph
+        as flat arrays, which is a compact alternative to walking through the
+        :class:`mas.graph.Vertex.Vertex` objects. For the vertex of identifier
+        i (see :meth:`get_vertex_id()`), following port ``ports[j]`` leads to
+        the vertex of identifier ``indices[j]``, for every j in
+        ``range(indptr[i], indptr[i+1])``.
+
+        Ports changed directly on the vertices (e.g. with
+        :meth:`mas.graph.Vertex.Vertex.reset_port_associations()`) after the
+        table was computed are not tracked.
+
+        :returns: The int32 arrays ``(indptr, indices, ports)``.
+        :rtype: tuple
+        """
+        self._compute_csr()
+        return self._indptr, self._indices, self._ports
+
     def remove_edge(self, u, v):
         """Remove an edge from the graph.
 
@@ -331,11 +598,9 @@ class Graph:
 
         success = success1 and success2
         if success:
-            if ((u, v) in self._edges):
-                self._edges.remove((u, v))
-            else:
-                self._edges.remove((v, u))
-            self._untoggle_computed()
+            key = self._edge_key(self._vertexToID[u], self._vertexToID[v])
+            self._edges.remove(self._edgeIndex.pop(key))
+            self._update_computed_after_edge_removal(u, v)
 
         return success
 
@@ -345,26 +610,40 @@ class Graph:
         :param vertex: The vertex to remove.
         :type vertex: :class:`mas.graph.Vertex.Vertex`
 
+        The vertex of largest identifier takes the identifier of the removed
+        one, so that identifiers remain 0, ..., n-1. The edges incident to the
+        vertex are removed as well, in time proportional to their number.
+
         :returns: True if vertex was successfully removed (if it belonged to
             the graph), False otherwise.
         :rtype: boolean
         """
         if vertex in self._vertexToID:
-            self._order -= 1
-            maxID = self._order
-            maxIDVertex = self._IDToVertex[maxID]
-            self._swap_vertices_ids(maxIDVertex, vertex)
-            del(self._vertexToID[vertex])
-            del(self._IDToVertex[maxID])
-            del(self._nameToVertex[vertex.name()])
-
-            for u in vertex.get_neighbors():
-                u.remove_neighbor(vertex)
-
+            self._remove_vertex(vertex)
             self._untoggle_computed()
             return True
         return False
 
+    def remove_vertices(self, vertices):
+        """Remove several vertices from the graph, invalidating the computed
+        matrices only once.
+
+        :param vertices: The vertices to remove.
+        :type vertices: iterable of :class:`mas.graph.Vertex.Vertex`
+
+        :returns: The number of vertices that were removed (that belonged to
+            the graph).
+        :rtype: int
+        """
+        removed = 0
+        for vertex in vertices:
+            if vertex in self._vertexToID:
+                self._remove_vertex(vertex)
+                removed += 1
+        if removed != 0:
+            self._untoggle_computed()
+        return removed
+
     def save(self, filename, ids="graph"):
         """Exports the graph to a txt file.
 
@@ -385,21 +664,48 @@ class Graph:
             elif (ids == "real"):
                 return vertex.name()
 
-        str = ""
-        i = 1
-        for vertex in self.vertices():
-            str += f"{id(vertex)}"
-            str += " " if i < self.order() else "\n"
-            i += 1
+        with open(filename, "w", buffering=self._WRITE_BUFFER) as f:
+            f.write(" ".join(f"{id(vertex)}" for vertex in self.vertices()))
+            f.write("\n")
+            for vertex in self.vertices():
+                f.write(f"{id(vertex)}")
+                for neighbor in vertex.get_neighbors():
+                    f.write(f" {id(neighbor)}")
+                f.write("\n")
+
+    def save_binary(self, filename, distances=False):
+        """Exports the graph to a binary file storing its port table (see
+        :meth:`port_table()`), its type and the names of its vertices, which
+        can be loaded back with :meth:`init_from_binary_file()` or mapped in
+        memory with :class:`mas.graph.MappedGraph.MappedGraph`.
 
-        for vertex in self.vertices():
-            str += f"{id(vertex)}"
-            for neighbor in vertex.get_neighbors():
-                str += f" {id(neighbor)}"
-            str += '\n'
+        :param filename: Name of the output file.
+        :type filename: string
 
-        with open(filename, "w") as f:
-            f.write(str)
+        :param distances: If set to True, the distance matrix is computed (if
+            needed) and saved as well.
+            Default to False.
+        :type distances: boolean, optional
+        """
+        names = [None] * self._order
+        for vertex, i in self._vertexToID.items():
+            names[i] = vertex.name()
+        binary_format.write(filename, *self.port_table(), names,
+                            type=self._type,
+                            distances=self.distance_matrix() if distances
+                            else None)
+
+    def set_distance_cache_budget(self, budget):
+        """Change the maximum amount of memory used to cache the rows computed
+        by :meth:`distances_from()`. The most recently used row is always kept,
+        whatever the budget.
+
+        :param budget: Memory budget, in bytes.
+            Default to ``Graph.DISTANCE_CACHE_BUDGET``.
+        :type budget: int
+        """
+        self._distance_cache_budget = budget
+        self._evict_distance_rows()
 
     def set_type(self, type):
         """Change the type of the graph. e.g. \"planar\", \"clique\", etc.
@@ -409,6 +715,24 @@ class Graph:
         """
         self._type = type
 
+    def sparse_adjacency(self):
+        """Compute (if needed) and get the adjacency matrix of the graph in
+        compressed sparse row format. Row and column indices are the
+        identifiers of the vertices (see :meth:`get_vertex_id()`): the
+        neighbors of the vertex of identifier i are
+        ``indices[indptr[i]:indptr[i+1]]``, where ``indptr`` and ``indices``
+        are int32 arrays.
+
+        :returns: The sparse adjacency matrix of the graph.
+        :rtype: scipy.sparse.csr_matrix
+            (https://docs.scipy.org/doc/scipy/reference/generated/scipy.sparse.csr_matrix.html)
+        """
+        self._compute_csr()
+        data = np.ones(len(self._indices), np.int8)
+        size = self._order
+        return csr_matrix((data, self._indices, self._indptr),
+                          shape=(size, size))
+
     def size(self):
         """Get the number of edges of the graph.
 
@@ -425,6 +749,16 @@ class Graph:
         """
         return self._type
 
+    def version(self):
+        """Get the version of the graph, incremented on each modification.
+
+        Results derived from the graph can be cached against this number.
+
+        :returns: The version of the graph.
+        :rtype: int
+        """
+        return self._version
+
     def vertices(self):
         """Get all the vertices of the graph.
 
@@ -438,66 +772,484 @@ class Graph:
         if self._adjacency_matrix_computed:
             return
 
-        size = self.order()
-        self._adjacency_matrix = np.zeros((size, size), int)
+        self._adjacency_matrix = self.sparse_adjacency().toarray().astype(int)
+        self._adjacency_matrix_computed = True
 
-        for vertex in self._vertexToID:
-            for neighbor in vertex.get_neighbors():
-                i = self._vertexToID[vertex]
-                k = self._vertexToID[neighbor]
-                self._adjacency_matrix[i, k] = 1
+    def _compute_csr(self):
+        if self._csr_computed:
+            return
 
-        self._adjacency_matrix_computed = True
+        rows = [None] * self._order
+        for vertex, i in self._vertexToID.items():
+            rows[i] = vertex.get_port_associations()
+
+        degrees = np.zeros(self._order + 1, np.int32)
+        degrees[1:] = [len(row) for row in rows]
+        self._indptr = np.cumsum(degrees, dtype=np.int32)
+        size = self._indptr[-1]
+        self._indices = np.fromiter(
+            (self._vertexToID[u] for row in rows for u in row.values()),
+            np.int32,
+            count=size
+        )
+        self._ports = np.fromiter((p for row in rows for p in row),
+                                  np.int32,
+                                  count=size)
+        self._csr_computed = True
+        self._cache_statistics["adjacency"]["rebuilds"] += 1
 
     def _compute_distance_matrix(self):
         if self._distance_matrix_computed:
             return
 
-        self._compute_adjacency_matrix()
+        self._compute_csr()
 
+        size = self._order
+        self._distance_matrix = np.empty((size, size), self._distance_dtype())
         self._diameter = 0
 
-        size = self._init_distMat()
-
-        for k in range(size):
-            for i in range(size):
-                for j in range(size):
-                    m = min(
-                        self._distance_matrix[i, j],
-                        self._distance_matrix[i, k] +
-                        self._distance_matrix[k, j]
-                    )
-                    self._distance_matrix[i, j] = m
-                    self._distance_matrix[j, i] = m
-                    if (k == size - 1) and (self._diameter <= m):
-                        self._diameter = m
+        chunk = max(1, self._DISTANCE_CHUNK_CELLS // max(size, 1))
+        for start in range(0, size, chunk):
+            sources = np.arange(start, min(start + chunk, size))
+            block = self._compute_distance_rows(sources)
+            self._distance_matrix[start:start + len(sources)] = block
+            self._diameter = max(self._diameter, int(block.max()))
 
+        self._clear_distance_rows()
         self._distance_matrix_computed = True
+        self._cache_statistics["distances"]["rebuilds"] += 1
 
     def _compute_is_connected(self):
-        if not self._is_connected_computed:
-            G = nx.from_numpy_array(self.adjacency_matrix())
-            self._is_connected = nx.is_connected(G)
+        if self._is_connected_computed:
+            return
+
+        # Every vertex holds the label of its component, and each label owns
+        # the set of vertices of its component. Merges relabel the smaller
+        # component and splits the smaller side, so that every vertex keeps
+        # pointing directly to its label.
+        count, labels = connected_components(self.sparse_adjacency(),
+                                             directed=False)
+        self._components_label = labels.tolist()
+        self._components = {label: set() for label in range(count)}
+        for vertex, ID in self._vertexToID.items():
+            self._components[self._components_label[ID]].add(vertex)
+        self._components_next_label = count
+        self._is_connected = count == 1
+        self._is_connected_computed = True
+        self._cache_statistics["connectivity"]["rebuilds"] += 1
 
     def _compute_is_planar(self):
-        if not self._is_planar_computed:
-            G = nx.from_numpy_array(self.adjacency_matrix())
-            self._is_planar = nx.check_planarity(G)[0]
+        if self._is_planar_version == self._version:
+            return
 
-    def _init_distMat(self):
-        size = self._order
-        self._distance_matrix = np.zeros((size, size), float)
+        # Graphs with fewer than 9 edges can not contain a subdivision of K5
+        # or K3,3, and planar graphs have at most 3n - 6 edges (n >= 3).
+        size = len(self._edges)
+        if size < 9:
+            self._is_planar = True
+        elif size > 3 * self._order - 6:
+            self._is_planar = False
+        else:
+            self._is_planar = nx.check_planarity(nx.Graph(self._edges))[0]
+        self._is_planar_version = self._version
+        self._cache_statistics["planarity"]["rebuilds"] += 1
+
+    def _clear_distance_rows(self):
+        self._distance_rows.clear()
+        self._distance_rows_nbytes = 0
+
+    def _compute_distance_rows(self, sources):
+        return _distance_rows(self.sparse_adjacency(), sources)
+
+    def _distance_dtype(self):
+        return _distance_dtype(self._order)
+
+    def _edge_key(self, i, k):
+        return (i, k) if i < k else (k, i)
+
+    def _evict_distance_rows(self):
+        while (len(self._distance_rows) > 1 and
+               self._distance_rows_nbytes > self._distance_cache_budget):
+            _, row = self._distance_rows.popitem(last=False)
+            self._distance_rows_nbytes -= row.nbytes
+
+    def _find_component(self, i):
+        return self._components_label[i]
+
+    def _init_from_edge_arrays(self, n, src, dst, ports=None, names=None):
+        if names is None:
+            names = range(n)
+        names = list(names)
+        if len(names) != n:
+            raise ValueError(f"{len(names)} names given for {n} vertices.")
+
+        # First occurrence of every edge, loops left aside, in array order.
+        src = np.asarray(src, np.int64)
+        dst = np.asarray(dst, np.int64)
+        _, kept = np.unique(np.minimum(src, dst) * n + np.maximum(src, dst),
+                            return_index=True)
+        kept = np.sort(kept[src[kept] != dst[kept]])
+
+        # Both ends of every kept edge, interleaved so that a stable sort
+        # by row lists the neighbors of every vertex in edge order.
+        rows = np.stack((src[kept], dst[kept]), axis=1).astype(np.int32)
+        order = np.argsort(rows.ravel(), kind="stable")
+        rows = rows.ravel()[order]
+        columns = np.stack((dst[kept], src[kept]), axis=1).astype(np.int32)
+        columns = columns.ravel()[order]
+        indptr = np.zeros(n + 1, np.int32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        if ports is None:
+            # The ports 0, 1, ... in the order of the edges of every vertex.
+            port_table = np.arange(len(rows), dtype=np.int32) - indptr[rows]
+        else:
+            port_table = np.stack((np.asarray(ports[0])[kept],
+                                   np.asarray(ports[1])[kept]),
+                                  axis=1).astype(np.int32).ravel()[order]
+            pairs = np.lexsort((port_table, rows))
+            repeated = ((rows[pairs][1:] == rows[pairs][:-1]) &
+                        (port_table[pairs][1:] == port_table[pairs][:-1]))
+            if repeated.any():
+                i = rows[pairs][1:][repeated][0]
+                raise ValueError(f"vertex {names[i]} is given the same port "
+                                 f"for several edges.")
+
+        self._init_from_port_table(indptr, columns, port_table, names)
+        # As for a graph built edge by edge, the port table is computed on
+        # demand, after the ports possibly reassigned through the vertices.
+        self._csr_computed = False
+
+    def _init_from_port_table(self, indptr, indices, ports, names):
+        vertices = [Vertex(name) for name in names]
+        self._IDToVertex = dict(enumerate(vertices))
+        self._vertexToID = {vertex: i for i, vertex in enumerate(vertices)}
+        self._nameToVertex = {vertex.name(): vertex for vertex in vertices}
+        self._order = len(vertices)
+
+        indptr = np.asarray(indptr, np.int32)
+        indices = np.asarray(indices, np.int32)
+        ports = np.asarray(ports, np.int32)
+
+        # Vertices and edges are built a chunk of the table at a time, so that
+        # no list of the size of the whole table is held along with them.
+        bounds = indptr.tolist()
+        for i, vertex in enumerate(vertices):
+            start, end = bounds[i], bounds[i + 1]
+            vertex._init_ports(ports[start:end].tolist(),
+                               [vertices[k]
+                                for k in indices[start:end].tolist()])
+
+        rows = np.repeat(np.arange(self._order), np.diff(indptr))
+        lower = rows < indices
+        rows = rows[lower]
+        columns = indices[lower]
+        self._edgeIndex = dict()
+        for start in range(0, len(rows), self._TABLE_CHUNK):
+            end = start + self._TABLE_CHUNK
+            for i, k in zip(rows[start:end].tolist(),
+                            columns[start:end].tolist()):
+                self._edgeIndex[(i, k)] = (vertices[i], vertices[k])
+        self._edges = set(self._edgeIndex.values())
+
+        # The port table is the loaded one.
+        self._untoggle_computed()
+        self._indptr = indptr
+        self._indices = indices
+        self._ports = ports
+        self._csr_computed = True
+
+    def _insert_csr_entry(self, i, k, port):
+        # Fresh arrays are built so that matrices previously returned by
+        # sparse_adjacency() or port_table() are left untouched.
+        self._indices = np.insert(self._indices, self._indptr[i + 1], k)
+        self._ports = np.insert(self._ports, self._indptr[i + 1], port)
+        indptr = self._indptr.copy()
+        indptr[i + 1:] += 1
+        self._indptr = indptr
+
+    def _modified(self):
+        # Called once the graph has been modified (once per batch, see
+        # batch()), for subclasses to drop what they derive from the graph.
+        pass
+
+    def _new_component(self, vertices):
+        label = self._components_next_label
+        self._components_next_label += 1
+        for vertex in vertices:
+            self._components_label[self._vertexToID[vertex]] = label
+        self._components[label] = vertices
+
+    def _read_only(self, array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def _remove_csr_entry(self, i, k):
+        start, end = self._indptr[i], self._indptr[i + 1]
+        position = start + np.flatnonzero(self._indices[start:end] == k)[0]
+        self._indices = np.delete(self._indices, position)
+        self._ports = np.delete(self._ports, position)
+        indptr = self._indptr.copy()
+        indptr[i + 1:] -= 1
+        self._indptr = indptr
+
+    def _remove_vertex(self, vertex):
+        ID = self._vertexToID[vertex]
+        for neighbor in vertex.get_neighbors():
+            key = self._edge_key(ID, self._vertexToID[neighbor])
+            self._edges.remove(self._edgeIndex.pop(key))
+            neighbor.remove_neighbor(vertex)
+            vertex.remove_neighbor(neighbor)
+
+        # The vertex of largest identifier moves to the freed identifier,
+        # and so do the index keys of its edges.
+        self._order -= 1
+        last = self._IDToVertex.pop(self._order)
+        if last is not vertex:
+            for neighbor in last.get_neighbors():
+                k = self._vertexToID[neighbor]
+                self._edgeIndex[self._edge_key(ID, k)] = self._edgeIndex.pop(
+                    self._edge_key(self._order, k))
+            self._vertexToID[last] = ID
+            self._IDToVertex[ID] = last
+        del self._vertexToID[vertex]
+
+        if self._nameToVertex.get(vertex.name()) is vertex:
+            del self._nameToVertex[vertex.name()]
+
+    def _repair_distance_row(self, row, i, k):
+        # Incremental BFS after the insertion of the edge {i, k}: only the
+        # vertices getting closer to the source are visited.
+        if row[i] > row[k]:
+            i, k = k, i
+        row[k] = row[i] + 1
+        queue = deque([k])
+        while queue:
+            x = queue.popleft()
+            d = row[x] + 1
+            for y in self._indices[self._indptr[x]:self._indptr[x + 1]]:
+                if row[y] > d:
+                    row[y] = d
+                    queue.append(y)
+
+    def _share_computed(self, graph):
+        # Identifiers being the same, the port table, matrices, cached rows
+        # and planarity of graph hold for the current graph. Port tables and
+        # rows are never modified in place; matrices are made read-only on both
+        # sides and copied by the first graph that modifies them.
+        if graph._csr_computed:
+            self._indptr = graph._indptr
+            self._indices = graph._indices
+            self._ports = graph._ports
+            self._csr_computed = True
+
+        if graph._adjacency_matrix_computed:
+            graph._adjacency_matrix = self._read_only(graph._adjacency_matrix)
+            self._adjacency_matrix = graph._adjacency_matrix
+            self._adjacency_matrix_computed = True
+
+        if graph._distance_matrix_computed:
+            graph._distance_matrix = self._read_only(graph._distance_matrix)
+            self._distance_matrix = graph._distance_matrix
+            self._diameter = graph._diameter
+            self._distance_matrix_computed = True
+        else:
+            self._distance_rows = OrderedDict(graph._distance_rows)
+            self._distance_rows_nbytes = graph._distance_rows_nbytes
+            self._distance_cache_budget = graph._distance_cache_budget
+
+        if graph._is_planar_version == graph._version:
+            self._is_planar = graph._is_planar
+            self._is_planar_version = self._version
+
+    def _split_component(self, u, v):
+        # Alternate two searches from the extremities of the removed edge:
+        # either they meet and the component is unchanged, or the first one
+        # to run out of vertices has found one side of the split.
+        seen = ({u}, {v})
+        queues = (deque([u]), deque([v]))
+        side = None
+        while side is None:
+            for s in (0, 1):
+                if not queues[s]:
+                    side = seen[s]
+                    break
+                for neighbor in queues[s].popleft().get_neighbors():
+                    if neighbor in seen[1 - s]:
+                        return
+                    if neighbor not in seen[s]:
+                        seen[s].add(neighbor)
+                        queues[s].append(neighbor)
+
+        # The side found keeps its vertices, with a fresh label, and the rest
+        # of the component keeps its label.
+        self._components[self._find_component(self._vertexToID[u])] -= side
+        self._new_component(side)
+        self._is_connected = False
+
+    def _update_computed_after_edge_insertion(self, u, v):
+        if self._batch_depth != 0:
+            self._untoggle_computed()
+            return
+
+        self._version += 1
+        i = self._vertexToID[u]
+        k = self._vertexToID[v]
+
+        if self._adjacency_matrix_computed:
+            self._adjacency_matrix = self._writable(self._adjacency_matrix)
+            self._adjacency_matrix[i, k] = 1
+            self._adjacency_matrix[k, i] = 1
+        if self._csr_computed:
+            self._insert_csr_entry(i, k, u.get_port_by_neighbor(v))
+            self._insert_csr_entry(k, i, v.get_port_by_neighbor(u))
+            self._cache_statistics["adjacency"]["avoided_rebuilds"] += 1
 
-        for i in range(size):
-            for j in range(i+1, size):
-                if self._adjacency_matrix[i, j] == 1:
-                    self._distance_matrix[i, j] = 1
-                    self._distance_matrix[j, i] = 1
-                else:
-                    self._distance_matrix[i, j] = self.INFTY
-                    self._distance_matrix[j, i] = self.INFTY
+        if self._distance_matrix_computed:
+            D = self._distance_matrix = self._writable(self._distance_matrix)
+            Di = D[i].astype(np.int32)
+            Dk = D[k].astype(np.int32)
+            sources = np.flatnonzero(np.abs(Di - Dk) > 1)
+            chunk = max(1, self._DISTANCE_CHUNK_CELLS // max(self._order, 1))
+            for start in range(0, len(sources), chunk):
+                s = sources[start:start + chunk]
+                through_ik = Di[s, None] + 1 + Dk[None, :]
+                through_ki = Dk[s, None] + 1 + Di[None, :]
+                shortcut = np.minimum(through_ik, through_ki)
+                D[s] = np.minimum(D[s], shortcut).astype(D.dtype)
+            self._diameter = int(D.max())
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+        elif len(self._distance_rows) != 0:
+            for source, row in list(self._distance_rows.items()):
+                if abs(int(row[i]) - int(row[k])) > 1:
+                    row = row.copy()
+                    self._repair_distance_row(row, i, k)
+                    row.flags.writeable = False
+                    self._distance_rows[source] = row
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+
+        if self._is_connected_computed:
+            label_i = self._find_component(i)
+            label_k = self._find_component(k)
+            if label_i != label_k:
+                # Union by size: relabeling the smaller component bounds the
+                # total work of a sequence of insertions.
+                if (len(self._components[label_i]) >
+                        len(self._components[label_k])):
+                    label_i, label_k = label_k, label_i
+                smaller = self._components.pop(label_i)
+                for vertex in smaller:
+                    self._components_label[self._vertexToID[vertex]] = label_k
+                self._components[label_k] |= smaller
+                self._is_connected = len(self._components) == 1
+            self._cache_statistics["connectivity"]["avoided_rebuilds"] += 1
+
+        # A non-planar graph remains non-planar when adding edges.
+        if (self._is_planar_version == self._version - 1 and
+                not self._is_planar):
+            self._is_planar_version = self._version
+            self._cache_statistics["planarity"]["avoided_rebuilds"] += 1
+
+        self._modified()
+
+    def _update_computed_after_edge_removal(self, u, v):
+        if self._batch_depth != 0:
+            self._untoggle_computed()
+            return
+
+        self._version += 1
+        i = self._vertexToID[u]
+        k = self._vertexToID[v]
+
+        if self._adjacency_matrix_computed:
+            self._adjacency_matrix = self._writable(self._adjacency_matrix)
+            self._adjacency_matrix[i, k] = 0
+            self._adjacency_matrix[k, i] = 0
+        if self._csr_computed:
+            self._remove_csr_entry(i, k)
+            self._remove_csr_entry(k, i)
+            self._cache_statistics["adjacency"]["avoided_rebuilds"] += 1
+
+        # Only the sources for which the edge lies on a shortest path to one
+        # of its extremities may see their distances change. Distances being
+        # symmetric, recomputing their rows also fixes their columns.
+        if self._distance_matrix_computed:
+            D = self._distance_matrix = self._writable(self._distance_matrix)
+            Di = D[i].astype(np.int32)
+            sources = np.flatnonzero(np.abs(Di - D[k]) == 1)
+            chunk = max(1, self._DISTANCE_CHUNK_CELLS // max(self._order, 1))
+            for start in range(0, len(sources), chunk):
+                s = sources[start:start + chunk]
+                D[s] = self._compute_distance_rows(s)
+            self._diameter = int(D.max())
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+        elif len(self._distance_rows) != 0:
+            for source, row in list(self._distance_rows.items()):
+                if abs(int(row[i]) - int(row[k])) == 1:
+                    row = self._compute_distance_rows(np.array([source]))[0]
+                    row.flags.writeable = False
+                    self._distance_rows[source] = row
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+
+        if self._is_connected_computed:
+            self._split_component(u, v)
+            self._cache_statistics["connectivity"]["avoided_rebuilds"] += 1
+
+        # A planar graph remains planar when removing edges.
+        if self._is_planar_version == self._version - 1 and self._is_planar:
+            self._is_planar_version = self._version
+            self._cache_statistics["planarity"]["avoided_rebuilds"] += 1
+
+        self._modified()
+
+    def _update_computed_after_vertex_insertion(self):
+        if self._batch_depth != 0:
+            self._untoggle_computed()
+            return
+
+        self._version += 1
+        ID = self._order - 1
 
-        return size
+        if self._adjacency_matrix_computed:
+            self._adjacency_matrix = np.pad(self._adjacency_matrix, (0, 1))
+        if self._csr_computed:
+            self._indptr = np.append(self._indptr, self._indptr[-1])
+            self._cache_statistics["adjacency"]["avoided_rebuilds"] += 1
+
+        if self._distance_matrix_computed:
+            D = self._distance_matrix.astype(self._distance_dtype())
+            D = np.pad(D, (0, 1), constant_values=self.INFTY)
+            D[ID, ID] = 0
+            self._distance_matrix = D
+            self._diameter = int(D.max())
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+        elif len(self._distance_rows) != 0:
+            dtype = self._distance_dtype()
+            for source, row in list(self._distance_rows.items()):
+                row = np.append(row, self.INFTY).astype(dtype)
+                row.flags.writeable = False
+                self._distance_rows[source] = row
+            self._distance_rows_nbytes = sum(
+                row.nbytes for row in self._distance_rows.values())
+            self._evict_distance_rows()
+            self._cache_statistics["distances"]["avoided_rebuilds"] += 1
+
+        if self._is_connected_computed:
+            self._components_label.append(-1)
+            self._new_component({self._IDToVertex[ID]})
+            self._is_connected = len(self._components) == 1
+            self._cache_statistics["connectivity"]["avoided_rebuilds"] += 1
+
+        # Isolated vertices do not change the planarity of a graph.
+        if self._is_planar_version == self._version - 1:
+            self._is_planar_version = self._version
+            self._cache_statistics["planarity"]["avoided_rebuilds"] += 1
+
+        self._modified()
+
+    def _writable(self, array):
+        return array if array.flags.writeable else array.copy()
 
     def __str__(self):
         str = "Graph{\n"
@@ -513,14 +1265,35 @@ class Graph:
         str += "\n}\n"
         return str
 
-    def _swap_vertices_ids(self, u, v):
-        IDu = self._vertexToID[u]
-        self._vertexToID[u] = self._vertexToID[v]
-        self._vertexToID[v] = IDu
-
     def _untoggle_computed(self):
+        self._version += 1
         self._adjacency_matrix_computed = False
+        self._csr_computed = False
         self._distance_matrix_computed = False
-        self._is_planar_computed = False
+        self._clear_distance_rows()
         self._is_connected_computed = False
 
+        if self._batch_depth != 0:
+            self._batch_modified = True
+        else:
+            self._modified()
+
+
+def _distance_dtype(order):
+    # Distances never exceed order - 1, so 16 bits are enough as long as both
+    # the order and INFTY fit in them.
+    if max(order, Graph.INFTY) <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def _distance_rows(adjacency, sources):
+    # Unweighted shortest paths, one BFS-like sweep per source. Callers keep
+    # the number of sources small, so that the float64 output of scipy never
+    # exceeds a few tens of megabytes before being narrowed.
+    rows = shortest_path(adjacency,
+                         directed=True,
+                         unweighted=True,
+                         indices=sources)
+    rows[np.isinf(rows)] = Graph.INFTY
+    return rows.astype(_distance_dtype(adjacency.shape[0]))
@@ -0,0 +1,261 @@
+from . import binary_format
+from .Graph import Graph, _distance_dtype, _distance_rows
+from .MappedVertex import MappedVertex
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+class MappedGraph:
+    """Read-only graph backed by a memory-mapped binary graph file."""
+
+    INFTY = Graph.INFTY
+
+    def __init__(self, filename):
+        """A read-only graph whose port table (and distance matrix, if it was
+        saved) are memory maps of a file written by
+        :meth:`mas.graph.Graph.Graph.save_binary()`. Opening it only reads the
+        header of the file, and processes opening the same file share a single
+        copy of the graph in memory.
+
+        It offers the read-only part of the interface of
+        :class:`mas.graph.Graph.Graph`, so that a
+        :class:`mas.agent.Simulation.Simulation` can run on it. Its vertices
+        are :class:`mas.graph.MappedVertex.MappedVertex` handles.
+
+        A mapped graph is pickled as the name of its file, which makes it cheap
+        to send to worker processes.
+
+        :param filename: Name of the binary graph file.
+        :type filename: string
+
+        :raises ValueError: If the file is not a binary graph file.
+        """
+        content = binary_format.read(filename, mmap=True)
+        self._filename = filename
+        self._indptr = content["indptr"]
+        self._indices = content["indices"]
+        self._ports = content["ports"]
+        self._names = content["names"]
+        self._type = content["type"]
+        self._distance_matrix = content["distances"]
+        self._order = len(self._indptr) - 1
+
+        self._nameToID = None
+        self._vertices = None
+        self._edges = None
+        self._is_connected = None
+        self._is_planar = None
+
+    def diameter(self):
+        """Get the maximum distance between two vertices.
+
+        :returns: The diameter of the graph (``MappedGraph.INFTY`` if the graph
+            is not connected).
+        :rtype: int
+        """
+        return int(self.distance_matrix().max(initial=0))
+
+    def distance(self, u, v):
+        """Get the distance between two vertices.
+
+        :param u: Any vertex of the graph.
+        :type u: :class:`mas.graph.MappedVertex.MappedVertex`
+
+        :param v: Any vertex of the graph.
+        :type v: :class:`mas.graph.MappedVertex.MappedVertex`
+
+        :returns: The distance between the u and v.
+        :rtype: int
+        """
+        return int(self.distances_from(u)[v._id])
+
+    def distance_matrix(self):
+        """Get the distance matrix of the graph: the mapped one if it was
+        saved, otherwise it is computed (once) in memory.
+
+        :returns: The distance matrix, where ``MappedGraph.INFTY`` stands for
+            an infinite distance.
+        :rtype: numpy.array
+        """
+        if self._distance_matrix is None:
+            size = self._order
+            D = np.empty((size, size), self._distance_dtype())
+            chunk = max(1, Graph._DISTANCE_CHUNK_CELLS // max(size, 1))
+            for start in range(0, size, chunk):
+                sources = np.arange(start, min(start + chunk, size))
+                D[start:start + len(sources)] = self._compute_distance_rows(
+                    sources)
+            self._distance_matrix = D
+        return self._distance_matrix
+
+    def distances_from(self, u):
+        """Get the distances from a vertex to every vertex of the graph. Unless
+        the distance matrix is available, they are computed on each call.
+
+        :param u: Any vertex of the graph.
+        :type u: :class:`mas.graph.MappedVertex.MappedVertex`
+
+        :returns: The distances from u, indexed by vertex identifiers.
+        :rtype: numpy.array
+        """
+        if self._distance_matrix is not None:
+            return self._distance_matrix[u._id]
+        return self._compute_distance_rows(np.array([u._id]))[0]
+
+    def edges(self):
+        """Get all the edges of the graph.
+
+        :returns: A set of edges (couples of vertices).
+        :rtype: set
+        """
+        if self._edges is None:
+            rows = np.repeat(np.arange(self._order), np.diff(self._indptr))
+            lower = rows < self._indices
+            self._edges = {
+                (MappedVertex(self, i), MappedVertex(self, k))
+                for i, k in zip(rows[lower].tolist(),
+                                self._indices[lower].tolist())
+            }
+        return self._edges
+
+    def get_vertex_by_id(self, ID):
+        """Get a vertex given its identifier.
+
+        :param ID: Identifier of a vertex.
+        :type ID: int
+
+        :returns: The vertex of the given identifier, None if there is no such
+            vertex.
+        :rtype: :class:`mas.graph.MappedVertex.MappedVertex`
+        """
+        if 0 <= ID < self._order:
+            return MappedVertex(self, ID)
+        return None
+
+    def get_vertex_by_name(self, name):
+        """Get a vertex given its name.
+
+        :param name: The name (not necessarily unique) of a vertex of the
+            graph.
+        :type name: string
+
+        :returns: The last vertex with this name, None if there is no such
+            vertex.
+        :rtype: :class:`mas.graph.MappedVertex.MappedVertex`
+        """
+        if self._nameToID is None:
+            self._nameToID = {name: i for i, name in enumerate(self._names)}
+        ID = self._nameToID.get(name)
+        return None if ID is None else MappedVertex(self, ID)
+
+    def get_vertex_id(self, vertex):
+        """Get the identifier of a vertex.
+
+        :param vertex: A vertex of the graph.
+        :type vertex: :class:`mas.graph.MappedVertex.MappedVertex`
+
+        :returns: The identifier of the vertex, None if it does not belong to
+            the graph.
+        :rtype: int
+        """
+        if isinstance(vertex, MappedVertex) and vertex._graph is self:
+            return vertex._id
+        return None
+
+    def is_connected(self):
+        """ Connexity test of the graph.
+
+        :returns: True if the graph is connected, False otherwise.
+        :rtype: boolean
+        """
+        if self._is_connected is None:
+            count, _ = connected_components(self.sparse_adjacency(),
+                                            directed=False)
+            self._is_connected = count == 1
+        return self._is_connected
+
+    def is_planar(self):
+        """ Planarity test of the graph.
+
+        :returns: True if the graph is planar, False otherwise.
+        :rtype: boolean
+        """
+        if self._is_planar is None:
+            G = nx.from_scipy_sparse_array(self.sparse_adjacency())
+            self._is_planar = nx.check_planarity(G)[0]
+        return self._is_planar
+
+    def order(self):
+        """Get the number of vertices of the graph.
+
+        :returns: The order of the graph.
+        :rtype: int
+        """
+        return self._order
+
+    def port_table(self):
+        """Get the port numbering of the whole graph as flat read-only arrays
+        (see :meth:`mas.graph.Graph.Graph.port_table()`).
+
+        :returns: The int32 arrays ``(indptr, indices, ports)``.
+        :rtype: tuple
+        """
+        return self._indptr, self._indices, self._ports
+
+    def size(self):
+        """Get the number of edges of the graph.
+
+        :returns: The size of the graph.
+        :rtype: int
+        """
+        return len(self._indices) // 2
+
+    def sparse_adjacency(self):
+        """Get the adjacency matrix of the graph in compressed sparse row
+        format, sharing its index arrays with the mapped file.
+
+        :returns: The sparse adjacency matrix.
+        :rtype: :class:`scipy.sparse.csr_matrix`
+        """
+        data = np.ones(len(self._indices), np.int8)
+        return csr_matrix((data, self._indices, self._indptr),
+                          shape=(self._order, self._order))
+
+    def type(self):
+        """Get the type of the graph.
+
+        :returns: The type of the graph.
+        :rtype: str
+        """
+        return self._type
+
+    def version(self):
+        """Get the version of the graph, which never changes.
+
+        :returns: The version of the graph.
+        :rtype: int
+        """
+        return 0
+
+    def vertices(self):
+        """Get all the vertices of the graph.
+
+        :returns: The vertices of the graph, associated to their unique
+            identifier.
+        :rtype: dict
+        """
+        if self._vertices is None:
+            self._vertices = {MappedVertex(self, i): i
+                              for i in range(self._order)}
+        return self._vertices
+
+    def _compute_distance_rows(self, sources):
+        return _distance_rows(self.sparse_adjacency(), sources)
+
+    def _distance_dtype(self):
+        return _distance_dtype(self._order)
+
+    def __reduce__(self):
+        return (MappedGraph, (self._filename,))
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class MappedVertex:
+    """A read-only vertex of a :class:`mas.graph.MappedGraph.MappedGraph`.
+    """
+
+    __slots__ = ("_graph", "_id")
+
+    def __init__(self, graph, ID):
+        """A lightweight handle on a vertex of a memory-mapped graph. It holds
+        no data of its own: two handles on the same vertex are equal, and can
+        be created and dropped at will.
+
+        :param graph: The graph the vertex belongs to.
+        :type graph: :class:`mas.graph.MappedGraph.MappedGraph`
+
+        :param ID: Identifier of the vertex in the graph.
+        :type ID: int
+        """
+        self._graph = graph
+        self._id = ID
+
+    def get_neighbor_by_port(self, port):
+        """Get a neighbor given a port.
+
+        :param port: Port number.
+        :type port: int
+
+        :returns: The neighbor reached when following the given port. If the
+            port does not exist, then returns None.
+        :rtype: :class:`mas.graph.MappedVertex.MappedVertex`
+        """
+        start, end = self._row()
+        hits = np.flatnonzero(self._graph._ports[start:end] == port)
+        if len(hits) == 0:
+            return None
+        return MappedVertex(self._graph,
+                            int(self._graph._indices[start + hits[0]]))
+
+    def get_neighbors(self):
+        """Get the list of all the neighbors.
+
+        :returns: All the neighbors of the current vertex, in the order they
+            were saved.
+        :rtype: list
+        """
+        start, end = self._row()
+        return [MappedVertex(self._graph, k)
+                for k in self._graph._indices[start:end].tolist()]
+
+    def get_port_associations(self):
+        """Get all the ports available from the vertex, associated to the
+        vertices they lead to.
+
+        :returns: A dictionary of vertices keyed by ports (int)
+        :rtype: dict
+        """
+        start, end = self._row()
+        return dict(zip(self._graph._ports[start:end].tolist(),
+                        self.get_neighbors()))
+
+    def get_port_by_neighbor(self, neighbor):
+        """Get the port leading to the given neighbor.
+
+        :param neighbor: A vertex.
+        :type neighbor: :class:`mas.graph.MappedVertex.MappedVertex`
+
+        :returns: The port leading to neighbor. None, if neighbor is not an
+            actual neighbor of the vertex.
+        :rtype: int
+        """
+        if (not isinstance(neighbor, MappedVertex) or
+                neighbor._graph is not self._graph):
+            return None
+        start, end = self._row()
+        hits = np.flatnonzero(self._graph._indices[start:end] == neighbor._id)
+        if len(hits) == 0:
+            return None
+        return int(self._graph._ports[start + hits[0]])
+
+    def get_ports(self):
+        """Get all the ports available.
+
+        :returns: The ports available from the given vertex.
+        :rtype: list
+        """
+        start, end = self._row()
+        return self._graph._ports[start:end].tolist()
+
+    def name(self):
+        """Get the name of the vertex.
+
+        :returns: Vertex name.
+        :rtype: string
+        """
+        return self._graph._names[self._id]
+
+    def _row(self):
+        indptr = self._graph._indptr
+        return int(indptr[self._id]), int(indptr[self._id + 1])
+
+    def __eq__(self, other):
+        return (isinstance(other, MappedVertex) and
+                self._graph is other._graph and
+                self._id == other._id)
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __str__(self):
+        names = [neighbor.name() for neighbor in self.get_neighbors()]
+        return f"{self.name()} : {'{'}{', '.join(map(str, names))}{'}'}"
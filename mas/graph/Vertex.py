@@ -1,7 +1,19 @@
+import heapq
+
+
 class Vertex:
     """A graph vertex.
     """
 
+    __slots__ = (
+        "_name",
+        "_portToNeighbor",
+        "_neighborToPort",
+        "_neighbors",
+        "_next_port",
+        "_unused_ports",
+    )
+
     def __init__(self, name):
         """A graph vertex.
 
@@ -10,9 +22,13 @@ class Vertex:
         """
         self._name = name
 
-        self._neighbors = []
-
+        # Ports and neighbors are indexed both ways, so that every lookup is
+        # done in constant time. The list of the neighbors is built when it is
+        # first asked for, and dropped when they change. Freed ports are kept
+        # in a min-heap and reused smallest first.
         self._portToNeighbor = dict()
+        self._neighborToPort = dict()
+        self._neighbors = None
         self._next_port = 0
         self._unused_ports = []
 
@@ -26,15 +42,15 @@ class Vertex:
             otherwise.
         :rtype: boolean
         """
-        if vertex not in self._neighbors:
+        if vertex not in self._neighborToPort:
             if len(self._unused_ports) != 0:
-                port = self._unused_ports[0]
-                self._unused_ports.remove(port)
+                port = heapq.heappop(self._unused_ports)
             else:
                 port = self._next_port
                 self._next_port += 1
-            self._neighbors.append(vertex)
+            self._neighborToPort[vertex] = port
             self._portToNeighbor[port] = vertex
+            self._neighbors = None
             return True
         return False
 
@@ -60,17 +76,18 @@ class Vertex:
             port does not exist, then returns None.
         :rtype: :class:`mas.graph.Vertex.Vertex`
         """
-        if port not in self._portToNeighbor:
-            return None
-
-        return self._portToNeighbor[port]
+        return self._portToNeighbor.get(port)
 
     def get_neighbors(self):
-        """Get the list of all the neighbors.
+        """Get the list of all the neighbors. The returned list is shared with
+        the vertex and must not be modified.
 
-        :returns: All the neighbors of the current vertex.
+        :returns: All the neighbors of the current vertex, in the order they
+            were added.
         :rtype: list
         """
+        if self._neighbors is None:
+            self._neighbors = list(self._neighborToPort)
         return self._neighbors
 
     def get_port_associations(self):
@@ -92,11 +109,7 @@ class Vertex:
             actual neighbor of the vertex.
         :rtype: int
         """
-        for port, vertex in self._portToNeighbor.items():
-            if vertex == neighbor:
-                return port
-
-        return None
+        return self._neighborToPort.get(neighbor)
 
     def get_ports(self):
         """Get all the ports available.
@@ -123,14 +136,11 @@ class Vertex:
         :returns: True if vertex was an actual neigbor, False otherwise.
         :rtype: boolean
         """
-        if vertex in self._neighbors:
-            for p, u in self._portToNeighbor.items():
-                if u == vertex:
-                    port = p
-                    break
-            self._neighbors.remove(vertex)
-            self._unused_ports.append(port)
+        if vertex in self._neighborToPort:
+            port = self._neighborToPort.pop(vertex)
             del(self._portToNeighbor[port])
+            self._neighbors = None
+            heapq.heappush(self._unused_ports, port)
             return True
         return False
 
@@ -162,31 +172,41 @@ class Vertex:
             Default to False.
         :type maintain_unused_ports: boolean, optional
         """
-        n = len(self._portToNeighbor.values())
-        if n != len(portToNeighbor.values()):
+        n = len(self._portToNeighbor)
+        if n != len(portToNeighbor):
             return False
 
-        for vertex in self._portToNeighbor.values():
-            if vertex not in portToNeighbor.values():
-                return False
-        self._portToNeighbor = portToNeighbor
+        if set(portToNeighbor.values()) != self._neighborToPort.keys():
+            return False
+        self._portToNeighbor = dict(portToNeighbor)
 
         if compress:
             port_list = list(self._portToNeighbor)
             port_list.sort()
-            print(port_list)
-            print(self._portToNeighbor)
             for i in range(0, n):
                 self._portToNeighbor[i] = self._portToNeighbor[port_list[i]]
                 del self._portToNeighbor[port_list[i]]
 
+        ports = {vertex: port for port, vertex in self._portToNeighbor.items()}
+        self._neighborToPort = {
+            vertex: ports[vertex] for vertex in self._neighborToPort
+        }
+
+        maxp = max(self._portToNeighbor, default=-1)
         if maintain_unused_ports:
-            maxp = max(list(self._portToNeighbor))
             self._unused_ports = [
                 i 
                 for i in range(0,maxp) 
                 if i not in self._portToNeighbor
             ]
+        else:
+            self._unused_ports = [
+                i
+                for i in self._unused_ports
+                if i not in self._portToNeighbor
+            ]
+            heapq.heapify(self._unused_ports)
+        self._next_port = max(self._next_port, maxp + 1)
 
         return True
 
@@ -200,10 +220,45 @@ class Vertex:
 
     def __str__(self):
         str = f"{self.name()} : {'{'}"
-        n = len(self._neighbors)
+        neighbors = self.get_neighbors()
+        n = len(neighbors)
         if (n != 0):
-            str += f"{self._neighbors[0].name()}"
+            str += f"{neighbors[0].name()}"
         for i in range(1, n):
-            str += f", {self._neighbors[i].name()}"
+            str += f", {neighbors[i].name()}"
         str += "}"
         return str
+
+    def _copy_ports(self, vertex, image):
+        # Give the vertex the ports of an other one, whose neighbors are
+        # replaced by their image: ports, neighbor order and unused ports are
+        # kept as they are.
+        self._portToNeighbor = {
+            port: image[neighbor]
+            for port, neighbor in vertex.get_port_associations().items()
+        }
+        self._neighborToPort = {
+            image[neighbor]: vertex.get_port_by_neighbor(neighbor)
+            for neighbor in vertex.get_neighbors()
+        }
+        self._neighbors = None
+        if isinstance(vertex, Vertex):
+            self._next_port = vertex._next_port
+            self._unused_ports = list(vertex._unused_ports)
+        else:
+            ports = list(self._portToNeighbor)
+            self._next_port = max(ports, default=-1) + 1
+            self._unused_ports = sorted(
+                set(range(self._next_port)).difference(ports))
+
+    def _init_ports(self, ports, neighbors):
+        # Bulk counterpart of add_neighbor for a vertex without neighbors,
+        # used by graph loaders: the ports are taken as given, and the ports
+        # they skip are the unused ones.
+        self._portToNeighbor = dict(zip(ports, neighbors))
+        self._neighborToPort = dict(zip(neighbors, ports))
+        self._neighbors = None
+        self._next_port = max(ports, default=-1) + 1
+        if self._next_port > len(ports):
+            self._unused_ports = sorted(
+                set(range(self._next_port)).difference(ports))
@@ -45,6 +45,8 @@ Module classes
 --------------
 
     * :class:`mas.graph.Graph.Graph`
+    * :class:`mas.graph.MappedGraph.MappedGraph`
+    * :class:`mas.graph.MappedVertex.MappedVertex`
     * :class:`mas.graph.Vertex.Vertex`
 
 Module content
@@ -53,18 +55,32 @@ Module content
 .. autoclass:: mas.graph.Graph.Graph
     :members:
 
+.. autoclass:: mas.graph.MappedGraph.MappedGraph
+    :members:
+    :special-members: __init__
+
+.. autoclass:: mas.graph.MappedVertex.MappedVertex
+    :members:
+    :special-members: __init__
+
 .. autoclass:: mas.graph.Vertex.Vertex
     :members:
     :special-members: __init__
 
 .. automodule:: mas.graph.graph_generator
     :members:
+
+.. automodule:: mas.graph.binary_format
+    :members:
 """
 
 __author__ = 'Sébastien Ratel'
 
 __all__ = [
     "Graph",
+    "MappedGraph",
+    "MappedVertex",
     "Vertex",
+    "binary_format",
     "graph_generator"
 ]
@@ -0,0 +1,145 @@
+"""Binary graph files.
+
+A binary graph file stores the port table of a graph (see
+:meth:`mas.graph.Graph.Graph.port_table()`) in a layout that can be read back
+without parsing, or memory-mapped:
+
+* the magic string ``MASGRAPH`` followed by the format version and the length
+  of the header, as two little-endian unsigned 32-bit integers;
+
+* a JSON header giving the order, the size and the type of the graph, the
+  names of the vertices and the offset, shape and data type of each array;
+
+* the arrays ``indptr`` (order + 1 entries), ``indices`` and ``ports``
+  (2 * size entries each), as little-endian 32-bit integers, optionally
+  followed by the ``distances`` matrix (order x order), each of them starting
+  on a 64-byte boundary.
+"""
+
+import json
+import numpy as np
+
+MAGIC = b"MASGRAPH"
+VERSION = 2
+
+_ALIGNMENT = 64
+_DTYPE = np.dtype("<i4")
+_PREFIX = np.dtype([("magic", "S8"), ("version", "<u4"), ("length", "<u4")])
+
+
+def read(filename, mmap=False):
+    """Read a binary graph file.
+
+    :param filename: Name of the file to read.
+    :type filename: string
+
+    :param mmap: If set to True, the arrays are read-only memory maps of the
+        file instead of being loaded in memory.
+        Default to False.
+    :type mmap: boolean, optional
+
+    :returns: The arrays ``"indptr"``, ``"indices"`` and ``"ports"`` of the
+        port table, the ``"names"`` of the vertices, the ``"type"`` of the
+        graph and its ``"distances"`` matrix (None if it was not saved).
+    :rtype: dict
+
+    :raises ValueError: If the file is not a binary graph file.
+    """
+    with open(filename, "rb") as file:
+        prefix = np.frombuffer(file.read(_PREFIX.itemsize), _PREFIX)
+        if len(prefix) != 1 or prefix["magic"][0] != MAGIC:
+            raise ValueError(f"{filename} is not a binary graph file.")
+        if prefix["version"][0] != VERSION:
+            raise ValueError(f"{filename} has an unsupported version "
+                             f"({prefix['version'][0]}).")
+        header = json.loads(file.read(int(prefix["length"][0])))
+
+        content = {"names": header["names"],
+                   "type": header["type"],
+                   "distances": None}
+        for name, (offset, shape, dtype) in header["arrays"].items():
+            if mmap:
+                array = np.memmap(file, dtype, "r", offset, tuple(shape))
+            else:
+                file.seek(offset)
+                count = int(np.prod(shape))
+                array = np.fromfile(file, dtype, count)
+                if len(array) != count:
+                    raise ValueError(f"{filename} is truncated.")
+                array = array.reshape(shape)
+            content[name] = array
+
+    return content
+
+
+def write(filename, indptr, indices, ports, names, type="unknown",
+          distances=None):
+    """Write a binary graph file.
+
+    :param filename: Name of the output file.
+    :type filename: string
+
+    :param indptr: The entries of vertex i are at positions
+        ``indptr[i]:indptr[i + 1]`` of indices and ports.
+    :type indptr: numpy.array
+
+    :param indices: Identifiers of the neighbors.
+    :type indices: numpy.array
+
+    :param ports: Ports leading to the neighbors.
+    :type ports: numpy.array
+
+    :param names: Names of the vertices, in identifier order. Names that can
+        not be stored in JSON are converted to strings.
+    :type names: list
+
+    :param type: Type of the graph.
+        Default to "unknown".
+    :type type: string, optional
+
+    :param distances: Distance matrix of the graph, stored with its own
+        integer type.
+        Default to None (no distance matrix).
+    :type distances: numpy.array, optional
+    """
+    arrays = {name: np.ascontiguousarray(array, _DTYPE)
+              for name, array in (("indptr", indptr),
+                                  ("indices", indices),
+                                  ("ports", ports))}
+    if distances is not None:
+        distances = np.asarray(distances)
+        arrays["distances"] = np.ascontiguousarray(
+            distances, distances.dtype.newbyteorder("<"))
+
+    header = {"order": len(arrays["indptr"]) - 1,
+              "size": len(arrays["indices"]) // 2,
+              "type": type,
+              "names": [_json_name(name) for name in names],
+              "arrays": {name: [0, list(array.shape), array.dtype.str]
+                         for name, array in arrays.items()}}
+
+    # The offsets depend on the length of the header, which depends on the
+    # offsets: leave room for them, then pad the header with spaces.
+    length = len(json.dumps(header).encode()) + 16 * len(arrays)
+    offset = _PREFIX.itemsize + length
+    for name, array in arrays.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        header["arrays"][name][0] = offset
+        offset += array.nbytes
+    encoded = json.dumps(header).encode().ljust(length)
+
+    prefix = np.array([(MAGIC, VERSION, length)], _PREFIX)
+    with open(filename, "wb") as file:
+        file.write(prefix.tobytes())
+        file.write(encoded)
+        for name, array in arrays.items():
+            file.write(b"\0" * (header["arrays"][name][0] - file.tell()))
+            array.tofile(file)
+
+
+def _json_name(name):
+    if isinstance(name, (str, int, float, bool)) or name is None:
+        return name
+    if isinstance(name, np.generic):
+        return name.item()
+    return str(name)
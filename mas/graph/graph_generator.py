@@ -1,7 +1,8 @@
 from .Graph import Graph
-from .Vertex import Vertex
 
-import random
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 """Generation of classical topologies."""
 
@@ -14,17 +15,11 @@ def binary_tree(height):
     :returns: A binary tree of given height.
     :rtype: class:`mas.graph.Graph.Graph`
     """
-    G = Graph()
-
-    for i in range(2**height-1):
-        G.add_vertex(Vertex(i))
-
-    for i in range(2**height-1):
-        u = G.get_vertex_by_name(i)
-        v = G.get_vertex_by_name(2*i+1)
-        w = G.get_vertex_by_name(2*i+2)
-        G.add_edge(u, v)
-        G.add_edge(u, w)
+    order = 2**height - 1
+    parents = np.repeat(np.arange(order), 2)
+    children = 2 * parents + np.tile([1, 2], order)
+    inside = children < order
+    G = Graph.from_edge_arrays(order, parents[inside], children[inside])
 
     G.set_type("binary tree")
 
@@ -40,14 +35,9 @@ def clique(size):
     :returns: A clique on size vertices.
     :rtype: class:`mas.graph.Graph.Graph`
     """
-    G = Graph()
-
-    for i in range(size):
-        u = Vertex(i)
-        G.add_vertex(u)
-        for j in range(i):
-            v = G.get_vertex_by_id(j)
-            G.add_edge(v, u)
+    # Vertex i is linked to vertices 0, ..., i-1, in this order.
+    rows, columns = np.tril_indices(size, -1)
+    G = Graph.from_edge_arrays(size, columns, rows)
 
     G.set_type("clique")
 
@@ -86,16 +76,22 @@ def grid(width, height):
     :returns: A width by height grid.
     :rtype: class:`mas.graph.Graph.Graph`
     """
-    G = Graph()
-
-    for i in range(width):
-        for j in range(height):
-            u = Vertex(f"({i},{j})")
-            G.add_vertex(u)
-            v = G.get_vertex_by_name(f"({i},{j-1})")
-            w = G.get_vertex_by_name(f"({i-1},{j})")
-            G.add_edge(u, v)
-            G.add_edge(u, w)
+    order = width * height
+    ids = np.arange(order)
+    left = ids[ids % height > 0]
+    up = ids[ids >= height]
+
+    # Vertex (i,j) is linked to (i,j-1) first, then to (i-1,j).
+    src = np.concatenate((left, up))
+    dst = np.concatenate((left - 1, up - height))
+    keys = np.concatenate((2 * left, 2 * up + 1))
+    edges_order = np.argsort(keys, kind="stable")
+
+    names = [f"({i},{j})" for i in range(width) for j in range(height)]
+    G = Graph.from_edge_arrays(order,
+                               src[edges_order],
+                               dst[edges_order],
+                               names=names)
 
     G.set_type(f"{width}x{height} grid")
 
@@ -112,27 +108,29 @@ def line(length):
     :rtype: class:`mas.graph.Graph.Graph`
     """
 
-    G = Graph()
-
-    for i in range(0, length):
-        G.add_vertex(Vertex(i))
-
-    for i in range(1, length):
-        u = G.get_vertex_by_id(i-1)
-        v = G.get_vertex_by_id(i)
-        G.add_edge(u, v)
-
-    u = G.get_vertex_by_id(0)
-    v = G.get_vertex_by_id(1)
-    u.reset_port_associations({1: v}, maintain_unused_ports=True)
+    # Port 0 leads to the previous vertex and port 1 to the next one.
+    src = np.arange(length - 1)
+    ports = (np.ones(length - 1, int), np.zeros(length - 1, int))
+    G = Graph.from_edge_arrays(length, src, src + 1, ports=ports)
 
     G.set_type("line")
 
     return G
 
 
-def random_graph(order, link_probability=0.5, connected=False):
-    """Generate a random graph.
+def random_graph(order, link_probability=0.5, connected=True, seed=None):
+    """Generate a random graph in the Erdős–Rényi model :math:`G(n,p)`. Edges
+    are drawn by geometric skips over the candidate pairs (Batagelj and
+    Brandes), so that the generation takes a time proportional to the order
+    plus the number of edges.
+
+    Previous versions ignored connected and drew graphs again until one was
+    connected, except for a null link_probability, which gave a graph without
+    edges. With the default connected=True, a null or small link_probability
+    now gives a graph with the linking edges (a random spanning tree for a
+    null one), and a connected graph is no longer drawn uniformly among the
+    connected graphs of :math:`G(n,p)`. Pass connected=False for the plain
+    :math:`G(n,p)` model.
 
     :param order: Number of vertices.
     :type order: int
@@ -141,33 +139,39 @@ def random_graph(order, link_probability=0.5, connected=False):
         Defaults to 0.5.
     :type link_probability: floating number between 0 and 1, optional.
 
-    :param connected: If set to True, then recreate a graph until it is
-        connected.
-        Defaults to False.
+    :param connected: If set to True, then the connected components of the
+        drawn graph are linked together by adding one edge between random
+        vertices of consecutive components (in a random order). If set to
+        False, the graph may be disconnected.
+        Defaults to True.
     :type connected: boolean, optional.
 
+    :param seed: Seed of the random generator, or the generator itself.
+        Defaults to None (fresh entropy).
+    :type seed: int or numpy.random.Generator, optional.
+
     :returns: A random graph on order vertices.
     :rtype: class:`mas.graph.Graph.Graph`
     """
     if link_probability < 0 or link_probability > 1:
         return Graph()
 
-    connected = False
-    while not connected:
-        G = Graph()
+    rng = np.random.default_rng(seed)
+
+    # Pair k stands for the edge {j, i}, where k = i(i-1)/2 + j and j < i.
+    pairs = _sample_pairs(order * (order - 1) // 2, link_probability, rng)
+    dst = ((1 + np.sqrt(1 + 8 * pairs.astype(float))) // 2).astype(np.int64)
+    dst[dst * (dst - 1) // 2 > pairs] -= 1
+    dst[dst * (dst + 1) // 2 <= pairs] += 1
+    src = pairs - dst * (dst - 1) // 2
 
-        for i in range(order):
-            u = Vertex(i)
-            G.add_vertex(u)
-            for j in range(i):
-                v = G.get_vertex_by_id(j)
-                if (random.random() <= link_probability):
-                    G.add_edge(v, u)
+    if connected and order > 1:
+        src, dst = _link_components(order, src, dst, rng)
 
-        connected = G.is_connected() or link_probability == 0
+    G = Graph.from_edge_arrays(order, src, dst)
 
     type = "random"
-    if connected:
+    if G.is_connected():
         type += " connected"
     if G.is_planar():
         type += " planar"
@@ -185,37 +189,68 @@ def star(order):
     :returns: A star on order vertices.
     :rtype: class:`mas.graph.Graph.Graph`
     """
-    G = Graph()
-    u = Vertex(0)
-    G.add_vertex(u)
-    for i in range(1, order):
-        v = Vertex(i)
-        G.add_vertex(v)
-        G.add_edge(u, v)
+    leaves = np.arange(1, order)
+    G = Graph.from_edge_arrays(order, np.zeros_like(leaves), leaves)
     return G
 
 
-def tree(order):
-    """Generate a random tree.
+def tree(order, seed=None):
+    """Generate a random tree: every vertex but the first one is linked to a
+    vertex drawn uniformly among the previous ones.
 
     :param order: Number of vertices in the tree.
     :type order: int
 
+    :param seed: Seed of the random generator, or the generator itself.
+        Defaults to None (fresh entropy).
+    :type seed: int or numpy.random.Generator, optional.
+
     :returns: A tree on order vertices.
     :rtype: class:`mas.graph.Graph.Graph`
     """
-    G = Graph()
-
-    u = Vertex(0)
-    vertices_tmp = [u]
-    G.add_vertex(u)
-    for i in range(1, order):
-        u = Vertex(i)
-        v = random.choice(vertices_tmp)
-        vertices_tmp.append(u)
-        G.add_vertex(u)
-        G.add_edge(u, v)
+    rng = np.random.default_rng(seed)
+    parents = rng.integers(np.arange(1, max(order, 1)))
+    G = Graph.from_edge_arrays(order, range(1, order), parents)
 
     G.set_type("tree")
 
     return G
+
+
+def _link_components(order, src, dst, rng):
+    adjacency = coo_matrix((np.ones(len(src), np.int8), (src, dst)),
+                           shape=(order, order))
+    count, labels = connected_components(adjacency, directed=False)
+    if count == 1:
+        return src, dst
+
+    # The first vertex of each component in a random permutation of the
+    # vertices is a uniformly chosen representative of this component.
+    permutation = rng.permutation(order)
+    _, first = np.unique(labels[permutation], return_index=True)
+    representatives = rng.permutation(permutation[first])
+
+    src = np.concatenate((src, representatives[:-1]))
+    dst = np.concatenate((dst, representatives[1:]))
+    return src, dst
+
+
+def _sample_pairs(total, probability, rng):
+    if total == 0 or probability == 0:
+        return np.empty(0, np.int64)
+    if probability == 1:
+        return np.arange(total, dtype=np.int64)
+
+    # Gaps between consecutive drawn pairs follow a geometric law. They are
+    # drawn by batches slightly larger than the expected remaining number of
+    # edges.
+    batches = []
+    last = -1
+    while last < total:
+        expected = (total - last) * probability
+        size = int(expected + 3 * np.sqrt(expected)) + 16
+        positions = last + np.cumsum(rng.geometric(probability, size))
+        batches.append(positions)
+        last = positions[-1]
+    pairs = np.concatenate(batches)
+    return pairs[pairs < total]
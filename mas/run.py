@@ -0,0 +1,143 @@
+"""Command line interface running a simulation without any display.
+
+Example::
+
+    mas-run grid 10 10 --algorithm random_walk --agents 4 --until visited
+
+runs 4 random walks on a 10x10 grid until every vertex is visited, and prints
+the number of steps. The topology is given by the name of a function of
+:mod:`mas.graph.graph_generator` followed by its arguments, and the algorithm
+by the name of a function of :mod:`mas.agent.agent_algorithms`.
+"""
+
+from mas.agent import agent_algorithms, termination
+from mas.agent.Simulation import Simulation
+from mas.graph import graph_generator
+
+import argparse
+import inspect
+import sys
+import time
+
+
+def main(argv=None):
+    """Parse the command line, run the simulation and print its outcome.
+
+    :param argv: The command line arguments.
+        Default to None (arguments of the process).
+    :type argv: list of strings, optional
+
+    :returns: The exit status: 0 if the termination condition holds at the
+        end of the run (or if there is none), 1 otherwise.
+    :rtype: int
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.max_steps is None and not args.until:
+        parser.error("--max-steps or --until is required")
+
+    generator = getattr(graph_generator, args.topology)
+    keywords = dict()
+    if "seed" in inspect.signature(generator).parameters:
+        keywords["seed"] = args.seed
+    topology = generator(*[_number(value) for value in args.parameters],
+                         **keywords)
+    algorithm = getattr(agent_algorithms, args.algorithm)
+    kernel = None
+    if args.kernel:
+        kernel = getattr(agent_algorithms, args.algorithm + "_kernel", None)
+        if kernel is None:
+            parser.error(f"{args.algorithm} has no kernel")
+
+    until = None
+    if args.until:
+        until = termination.any_of(*[termination.CONDITIONS[name]
+                                     for name in args.until])
+
+    simulation = Simulation(
+        topology,
+        algorithm=algorithm,
+        agents_number=args.agents,
+        anonymous=args.anonymous,
+        synchronous=not args.asynchronous,
+        anonymous_topology=args.anonymous_topology,
+        agents_with_memory=args.agents_with_memory,
+        nodes_with_memory=args.nodes_with_memory,
+        number_of_pebbles=args.pebbles,
+        async_proba=args.async_proba,
+        seed=args.seed,
+        kernel=kernel
+    )
+
+    start = time.perf_counter()
+    steps = simulation.run(max_steps=args.max_steps, until=until)
+    elapsed = time.perf_counter() - start
+
+    terminated = until is None or until(simulation)
+    print(f"steps: {steps}")
+    print(f"terminated: {terminated}")
+    print(f"time: {elapsed:.3f}s")
+
+    return 0 if terminated else 1
+
+
+def _choices(module):
+    return sorted(name for name in dir(module)
+                  if not name.startswith("_") and
+                  callable(getattr(module, name)) and
+                  getattr(module, name).__module__ == module.__name__)
+
+
+def _number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="mas-run",
+        description="Run a mobile agents simulation without any display."
+    )
+    parser.add_argument("topology", choices=_choices(graph_generator),
+                        help="topology generator")
+    parser.add_argument("parameters", nargs="*",
+                        help="parameters of the topology generator")
+    parser.add_argument("--algorithm", default="random_walk",
+                        choices=[name for name in _choices(agent_algorithms)
+                                 if not name.endswith("_kernel")],
+                        help="algorithm of the agents (default: random_walk)")
+    parser.add_argument("--kernel", action="store_true",
+                        help="run the vectorized version of the algorithm "
+                             "(synchronous model only)")
+    parser.add_argument("--agents", type=int, default=1,
+                        help="number of agents (default: 1)")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="maximum number of steps")
+    parser.add_argument("--until", action="append",
+                        choices=sorted(termination.CONDITIONS),
+                        help="termination condition, may be repeated to stop "
+                             "when any of them holds")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the random generator")
+    parser.add_argument("--asynchronous", action="store_true",
+                        help="asynchronous model")
+    parser.add_argument("--async-proba", type=float, default=0.3,
+                        help="probability for an agent not to act in a step "
+                             "of the asynchronous model (default: 0.3)")
+    parser.add_argument("--anonymous", action="store_true",
+                        help="anonymous agents")
+    parser.add_argument("--anonymous-topology", action="store_true",
+                        help="anonymous vertices")
+    parser.add_argument("--agents-with-memory", action="store_true",
+                        help="agents with memory")
+    parser.add_argument("--nodes-with-memory", action="store_true",
+                        help="vertices with memory")
+    parser.add_argument("--pebbles", type=int, default=0,
+                        help="number of pebbles of each agent (default: 0)")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,24 +33,6 @@ class GraphViz(Graph):
         self._init_vertices_graphics()
         self._init_edges_graphics()
 
-    def add_edge(self, u, v):
-        """
-          See :meth:`mas.graph.Graph.Graph.add_edge()`.
-        """
-        success = Graph.add_edge(self, u, v)
-        if success:
-            self._positions_computed = False
-        return success
-
-    def add_vertex(self, vertex):
-        """
-          See :meth:`mas.graph.Graph.Graph.add_vertex()`.
-        """
-        success = Graph.add_vertex(self, vertex)
-        if success:
-            self._positions_computed = False
-        return success
-
     def draw(self, canvas):  # pragma: no cover
         """Draw the graph.
 
@@ -74,7 +56,8 @@ class GraphViz(Graph):
         :rtype: list
         """
         if not self.is_planar():
-            self._layout_all_methods.remove("planar")
+            if "planar" in self._layout_all_methods:
+                self._layout_all_methods.remove("planar")
         else:
             if "planar" not in self._layout_all_methods:
                 self._layout_all_methods.append("planar")
@@ -165,24 +148,6 @@ class GraphViz(Graph):
         """
         return self._vertex_radius
 
-    def remove_vertex(self, vertex):
-        """
-          See :meth:`mas.graph.Graph.Graph.remove_vertex()`.
-        """
-        success = Graph.remove_vertex(self, vertex)
-        if success:
-            self._positions_computed = False
-        return success
-
-    def remove_edge(self, u, v):
-        """
-          See :meth:`mas.graph.Graph.Graph.remove_edge()`.
-        """
-        success = Graph.remove_edge(self, u, v)
-        if success:
-            self._positions_computed = False
-        return success
-
     def set_layout_method(self, layout_method):
         """Change the algorithm used to compute the coordinates of the vertices.
 
@@ -242,8 +207,7 @@ class GraphViz(Graph):
         if self._positions_computed:
             return
 
-        adjMat = self.adjacency_matrix()
-        G = nx.from_numpy_array(adjMat)
+        G = nx.from_scipy_sparse_array(self.sparse_adjacency())
         pos = self._nx_layout(G)
 
         for v in self.vertices():
@@ -303,6 +267,9 @@ class GraphViz(Graph):
         self._vertex_radius = 6
         self._vertex_color = "navy"
 
+    def _modified(self):
+        self._positions_computed = False
+
     def _nx_layout(self, nxgraph):  # pragma: no cover
         if self._layout_method == "circo":
             return nx.nx_pydot.pydot_layout(nxgraph, prog="circo")
@@ -31,4 +31,7 @@ setup(
         'pydot',
         'pytest_mock'
     ],
+    entry_points={
+        "console_scripts": ["mas-run = mas.run:main"],
+    },
 )
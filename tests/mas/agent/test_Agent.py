@@ -491,4 +491,17 @@ def test_remaining_pebbles():
     assert a.leave_pebble()
     assert a.remaining_pebbles() == 0
     assert not a.leave_pebble()
-    assert a.remaining_pebbles() == 0
\ No newline at end of file
+    assert a.remaining_pebbles() == 0
+
+def test_rng():
+    G, _ = _trivial_graph()
+    sim = Simulation(G, agents_number=2, seed=3)
+    other = Simulation(G, agents_number=2, seed=3)
+    a1, a2 = sim.get_all_agents()
+    b1, _ = other.get_all_agents()
+
+    assert a1.rng() is a1.rng()
+    assert a1.rng() is not a2.rng()
+    assert [b1.rng().random() for _ in range(3)] == \
+        [a1.rng().random() for _ in range(3)]
+    assert a1.rng().random() != a2.rng().random()
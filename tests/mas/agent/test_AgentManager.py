@@ -5,6 +5,8 @@ from mas.graph.graph_generator import random_graph
 
 from mas.agent.Agent import Agent
 
+import numpy as np
+
 
 def _trivial_graph():
     G = Graph()
@@ -36,6 +38,26 @@ def test_init_desired_id():
     assert not manager.get_agent_id(a2) == 3
 
 
+def test_get_agent_by_id():
+    G, _ = _trivial_graph()
+
+    a1 = Agent(desired_id=3)
+    a2 = Agent(desired_id=3)
+    a3 = Agent()
+
+    manager = AgentManager([a1, a2, a3], G)
+    for agent in (a1, a2, a3):
+        id = manager.get_agent_id(agent)
+        assert manager.get_agent_by_id(id) is agent
+        assert manager.get_agent_index_by_id(id) == \
+            manager.get_agent_index(agent)
+    assert manager.get_agent_by_id(-1) is None
+    assert manager.get_agent_index_by_id(-1) is None
+
+    ids = [manager.get_agent_id(a3), -1, 3]
+    assert manager.get_agents(ids) == [a3, None, a1]
+
+
 def test_init_possible_latencies():
     G, _ = _trivial_graph()
 
@@ -231,3 +253,75 @@ def test_add_and_remove_pebble_to_agent():
     assert manager.add_pebble_to_agent(a)
     assert manager.get_remaining_pebbles_of_agent(a) == 1
 
+
+def test_get_agent_index():
+    G, _ = _trivial_graph()
+    a1 = Agent()
+    a2 = Agent()
+
+    manager = AgentManager([a1, a2], G)
+    assert manager.get_agent_index(a1) == 0
+    assert manager.get_agent_index(a2) == 1
+
+
+def test_get_agents_on_position():
+    G, u, v = _edge_graph()
+    a1 = Agent(desired_position=u)
+    a2 = Agent(desired_position=v)
+    a3 = Agent(desired_position=u)
+
+    manager = AgentManager([a1, a2, a3], G)
+    assert manager.get_agents_on_position(u) == [a1, a3]
+    assert list(manager.get_all_agents_positions_ids()) == [
+        G.get_vertex_id(u), G.get_vertex_id(v), G.get_vertex_id(u)]
+
+    manager.move_agent(a1, 0)
+    assert manager.get_agents_on_position(u) == [a3]
+    assert manager.get_agents_on_position(v) == [a1, a2]
+    assert manager.get_all_agents_positions() == {a1: v, a2: v, a3: u}
+
+
+def test_get_agents_with_status():
+    G, _ = _trivial_graph()
+    a1 = Agent()
+    a2 = Agent()
+
+    manager = AgentManager([a1, a2], G, initial_status="searching")
+    assert manager.get_agents_with_status("searching") == [a1, a2]
+    assert manager.get_agents_with_status("done") == []
+
+    manager.set_agent_status(a2, "done")
+    assert manager.get_agents_with_status("searching") == [a1]
+    assert manager.get_agents_with_status("done") == [a2]
+    assert manager.get_agent_status(a2) == "done"
+
+
+def test_port_back():
+    G, u, v = _edge_graph()
+    a = Agent(desired_position=u)
+
+    manager = AgentManager([a], G)
+    assert manager.get_agent_port_back(a) is None
+
+    manager.move_agent(a, 0)
+    assert manager.get_agent_port_back(a) == v.get_port_by_neighbor(u)
+
+    manager.reset_agent_port_back(a)
+    assert manager.get_agent_port_back(a) is None
+
+
+def test_move_agents():
+    G, u, v = _edge_graph()
+    a1 = Agent(desired_position=u)
+    a2 = Agent(desired_position=v)
+
+    manager = AgentManager([a1, a2], G)
+    assert not manager.get_agent_position_contains_mate(a1)
+
+    port = v.get_port_by_neighbor(u)
+    manager.move_agents(np.array([0]), np.array([G.get_vertex_id(v)]),
+                        np.array([port]), 3)
+    assert manager.get_agent_position(a1) == v
+    assert manager.get_agent_port_back(a1) == port
+    assert manager.get_agent_position_contains_mate(a1)
+    assert manager.get_agent_position_contains_mate(a2)
@@ -1,10 +1,14 @@
 from mas.agent.Simulation import Simulation
 from mas.agent.Agent import Agent
+from mas.agent import topology_evolution
+from mas.agent.agent_algorithms import random_walk, random_walk_kernel
 
 from mas.graph.Graph import Graph
 from mas.graph.Vertex import Vertex
-from mas.graph.graph_generator import line, cycle
+from mas.graph.graph_generator import line, cycle, clique, grid
 
+import numpy as np
+import pytest
 import random
 
 
@@ -53,6 +57,18 @@ def test_get_agent():
     assert sim2.get_agent(4) == a2
 
 
+def test_get_agents():
+    G, _ = _trivial_graph()
+
+    a1 = Agent(desired_id=0)
+    a2 = Agent(desired_id=4)
+    sim = Simulation(G, agents_list=[a1, a2])
+
+    assert sim.get_agents([4, 1, 0]) == [a2, None, a1]
+    assert sim.get_agents(np.array([0, 4])) == [a1, a2]
+    assert sim.get_agents([]) == []
+
+
 def test_get_all_agents():
     G, _ = _trivial_graph()
 
@@ -157,7 +173,7 @@ def test_asynchronous_step_algo(mocker):
 
     assert manager.get_agent_position(a) == u
 
-    mocker.patch.object(random, 'random', return_value=0)
+    mocker.patch.object(sim.rng(), 'random', return_value=0)
     sim.step_algo()
     assert manager.get_agent_position(a) == u
     sim.step_algo()
@@ -165,7 +181,7 @@ def test_asynchronous_step_algo(mocker):
     sim.step_algo()
     assert manager.get_agent_position(a) == u
 
-    mocker.patch.object(random, 'random', return_value=1)
+    mocker.patch.object(sim.rng(), 'random', return_value=1)
     sim.step_algo()
     assert manager.get_agent_position(a) == v
     sim.step_algo()
@@ -277,3 +293,308 @@ def test_notify_encounters_synchronous():
     assert manager.get_agent_position_contains_mate(a2)
     assert not manager.get_agent_position_contains_mate(a3)
 
+
+def test_notify_encounters_random_walks():
+    for synchronous in (True, False):
+        sim = Simulation(cycle(5), random_walk, agents_number=4,
+                         synchronous=synchronous, seed=1)
+        manager = sim.get_agents_manager()
+        vertices_manager = sim.get_vertices_manager()
+        for _ in range(50):
+            sim.step_algo()
+            for agent in sim.get_all_agents():
+                position = manager.get_agent_position(agent)
+                assert manager.get_agent_position_contains_mate(agent) == (
+                    vertices_manager.get_occupancy(position) > 1)
+
+
+def test_update_topology():
+    G = cycle(3)
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(2)
+    w = G.get_vertex_by_id(1)
+
+    a = Agent(desired_position=u)
+    sim = Simulation(G, agents_list=[a], algorithm=_follow_port_zero)
+    a.join_to_simulation(sim)
+    manager = sim.get_agents_manager()
+
+    sim.step_algo()
+    assert manager.get_agent_position(a) == v
+    assert manager.get_agent_port_back(a) == v.get_port_by_neighbor(u)
+
+    uv = frozenset({u, v})
+    vw = frozenset({v, w})
+    uw = frozenset({u, w})
+
+    sim.update_topology(removed=[(u, v)])
+    assert u.get_port_by_neighbor(v) is None
+    assert manager.get_agent_port_back(a) is None
+    assert sim.get_visited_edges() == {vw: None, uw: None}
+
+    sim.update_topology(added=[(v, u)])
+    assert u.get_port_by_neighbor(v) is not None
+    assert sim.get_visited_edges() == {vw: None, uw: None, uv: None}
+
+
+def test_topology_evolution():
+    G = cycle(3)
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(2)
+    steps = []
+
+    def evolution(topology, step):
+        steps.append(step)
+        if step % 2 == 1:
+            return [], [(u, v)]
+        return [(u, v)], []
+
+    sim = Simulation(G, topology_evolution=evolution)
+    sim.step_algo()
+    assert u.get_port_by_neighbor(v) is None
+    sim.step_algo()
+    assert u.get_port_by_neighbor(v) is not None
+    assert steps == [1, 2]
+
+
+def test_get_visited_vertices_number():
+    G = cycle(3)
+    u = G.get_vertex_by_id(0)
+
+    a = Agent(desired_position=u)
+    sim = Simulation(G, agents_list=[a], algorithm=_follow_port_zero)
+    a.join_to_simulation(sim)
+
+    assert sim.get_visited_vertices_number() == 0
+    for expected in (1, 2, 3, 3):
+        sim.step_algo()
+        assert sim.get_visited_vertices_number() == expected
+
+
+def test_run():
+    G, u, v = _edge_graph()
+
+    a = Agent(desired_position=u)
+    sim = Simulation(G, agents_list=[a], algorithm=_follow_port_zero)
+    a.join_to_simulation(sim)
+    manager = sim.get_agents_manager()
+
+    calls = []
+    assert sim.run(max_steps=5, callback=calls.append, callback_every=2) == 5
+    assert calls == [sim, sim]
+    assert sim.get_step() == 6
+    assert manager.get_agent_position(a) == v
+
+    def at_u(simulation):
+        return manager.get_agent_position(a) == u
+
+    assert sim.run(until=at_u) == 1
+    assert sim.run(until=at_u) == 0
+    assert sim.run(max_steps=3, until=lambda simulation: False) == 3
+
+    with pytest.raises(ValueError):
+        sim.run()
+
+
+def _random_walk_positions(seed, synchronous):
+    G = cycle(20)
+    sim = Simulation(G, agents_number=5, algorithm=random_walk,
+                     synchronous=synchronous, seed=seed)
+    manager = sim.get_agents_manager()
+    sim.run(max_steps=50)
+    return [(manager.get_agent_id(agent),
+             G.get_vertex_id(manager.get_agent_position(agent)))
+            for agent in sim.get_all_agents()]
+
+
+def test_seed():
+    for synchronous in (True, False):
+        positions = _random_walk_positions(4, synchronous)
+        random.seed(0)
+        assert _random_walk_positions(4, synchronous) == positions
+        assert _random_walk_positions(5, synchronous) != positions
+
+
+def _check_kernel_consistency(sim, G):
+    manager = sim.get_agents_manager()
+    vertices_manager = sim.get_vertices_manager()
+    edges = {frozenset(edge) for edge in G.edges()}
+    visited = sim.get_visited_vertices()
+    visited_edges = sim.get_visited_edges()
+
+    for agent in sim.get_all_agents():
+        position = manager.get_agent_position(agent)
+        previous = sim.get_agent_previous_position(agent)
+        assert agent in vertices_manager.get_agents_on_vertex(position)
+        assert visited[previous] is not None
+        if position != previous:
+            port_back = manager.get_agent_port_back(agent)
+            assert position.get_neighbor_by_port(port_back) == previous
+            assert visited_edges[frozenset({position, previous})] is not None
+        mates = len(vertices_manager.get_agents_on_vertex(position)) > 1
+        assert manager.get_agent_position_contains_mate(agent) == mates
+
+    assert set(visited_edges) == edges
+    assert sim.get_visited_vertices_number() == \
+        sum(agent is not None for agent in visited.values())
+
+
+def test_kernel():
+    G = grid(6, 6)
+    sim = Simulation(G, agents_number=30, algorithm=random_walk,
+                     kernel=random_walk_kernel, seed=1)
+    sim.run(max_steps=10)
+    _check_kernel_consistency(sim, G)
+    assert all(agent.get_moves_nb() == 10 for agent in sim.get_all_agents())
+
+    u, v = next(iter(G.edges()))
+    sim.update_topology(removed=[(u, v)])
+    sim.run(max_steps=10)
+    _check_kernel_consistency(sim, G)
+
+
+def test_kernel_latencies():
+    G = cycle(4)
+    a1 = Agent(desired_position=G.get_vertex_by_id(0), desired_latency=1)
+    a2 = Agent(desired_position=G.get_vertex_by_id(0), desired_latency=2)
+    agents = [a1, a2]
+    sim = Simulation(G, agents_list=agents, algorithm=random_walk,
+                     kernel=random_walk_kernel)
+    a1.join_to_simulation(sim)
+    a2.join_to_simulation(sim)
+
+    # Reordering the list given to the simulation does not mix the agents.
+    agents.reverse()
+    sim.run(max_steps=6)
+    assert a1.get_moves_nb() == 6
+    assert a2.get_moves_nb() == 3
+
+
+def test_kernel_topology_evolution():
+    G = grid(5, 5)
+    evolution = topology_evolution.random_churn(list(G.edges()), 0.3, 0.3,
+                                                seed=5)
+    sim = Simulation(G, agents_number=40, algorithm=random_walk,
+                     kernel=random_walk_kernel, topology_evolution=evolution,
+                     seed=5)
+    manager = sim.get_agents_manager()
+    sim.step_algo()
+    # The reverse entries follow the changes instead of being searched again.
+    sim._kernel_slots = None
+    for _ in range(20):
+        previous = manager.get_all_agents_positions_ids().copy()
+        sim.step_algo()
+        indptr, indices, _ = G.port_table()
+        rows = np.repeat(np.arange(G.order()), np.diff(indptr))
+        reverse = sim._kernel_reverse
+        assert np.array_equal(indices[reverse], rows)
+        assert np.array_equal(rows[reverse], indices)
+    # The topology changes did not synchronize the simulation.
+    assert sim._kernel_pending
+
+    positions = manager.get_all_agents_positions_ids()
+    ports_back = manager.get_all_agents_ports_back()
+    indptr, indices, ports = G.port_table()
+    for i in range(len(positions)):
+        if ports_back[i] >= 0:
+            slots = range(indptr[positions[i]], indptr[positions[i] + 1])
+            assert [indices[j] for j in slots
+                    if ports[j] == ports_back[i]] == [previous[i]]
+
+    edges = {frozenset(edge) for edge in G.edges()}
+    visited_edges = sim.get_visited_edges()
+    assert set(visited_edges) == edges
+    for agent in sim.get_all_agents():
+        position = manager.get_agent_position(agent)
+        if manager.get_agent_port_back(agent) is not None:
+            assert visited_edges[frozenset(
+                {position, sim.get_agent_previous_position(agent)})]
+
+
+def test_kernel_distribution():
+    for kernel in (None, random_walk_kernel):
+        G = clique(5)
+        u = G.get_vertex_by_id(0)
+        agents = [Agent(desired_position=u) for _ in range(4000)]
+        sim = Simulation(G, agents_list=agents, algorithm=random_walk,
+                         kernel=kernel, seed=2)
+        for agent in agents:
+            agent.join_to_simulation(sim)
+        sim.step_algo()
+
+        manager = sim.get_agents_manager()
+        counts = np.bincount(manager.get_all_agents_positions_ids(),
+                             minlength=5)
+        assert counts[0] == 0
+        assert all(850 < count < 1150 for count in counts[1:])
+
+
+def _check_contains_mate(sim):
+    manager = sim.get_agents_manager()
+    vertices_manager = sim.get_vertices_manager()
+    for agent in sim.get_all_agents():
+        position = manager.get_agent_position(agent)
+        mates = len(vertices_manager.get_agents_on_vertex(position)) > 1
+        assert manager.get_agent_position_contains_mate(agent) == mates
+
+
+def test_encounters_after_synchronous_steps():
+    G = grid(3, 3)
+    sim = Simulation(G, agents_number=6, algorithm=random_walk,
+                     possible_latencies=[1, 2], seed=3)
+    for agent in sim.get_all_agents():
+        agent.join_to_simulation(sim)
+    for _ in range(20):
+        sim.step_algo()
+        _check_contains_mate(sim)
+    assert sim.get_encounters() is None
+
+
+def test_record_encounters():
+    G = line(3)
+    u, v, w = (G.get_vertex_by_id(i) for i in range(3))
+    a1 = Agent(desired_position=u)
+    a2 = Agent(desired_position=w)
+    a3 = Agent(desired_position=v)
+
+    def walk_once(agent):
+        if agent.get_moves_nb() == 0 and agent.get_position_id() != 1:
+            agent.move_along(agent.available_ports()[0])
+
+    for synchronous in (True, False):
+        sim = Simulation(G, agents_list=[a1, a2, a3], algorithm=walk_once,
+                         synchronous=synchronous, async_proba=0,
+                         record_encounters=True)
+        for agent in (a1, a2, a3):
+            agent._moves_nb = 0
+            agent.join_to_simulation(sim)
+        assert sim.get_encounters() == []
+
+        sim.step_algo()
+        sim.step_algo()
+        encounters = sim.get_encounters()
+        assert encounters[-1] == (1, v, frozenset({a1, a2, a3}))
+        if synchronous:
+            assert len(encounters) == 1
+        else:
+            assert len(encounters) == 2
+            assert encounters[0][1] == v
+            assert len(encounters[0][2]) == 2
+
+
+def test_record_encounters_kernel():
+    G = cycle(5)
+    sim = Simulation(G, agents_number=4, algorithm=random_walk,
+                     kernel=random_walk_kernel, seed=4,
+                     record_encounters=True)
+    positions = []
+    sim.run(max_steps=30, callback=lambda sim: positions.append(
+        sim.get_agents_manager().get_all_agents_positions()))
+
+    encounters = sim.get_encounters()
+    assert encounters
+    for step, vertex, agents in encounters:
+        after = positions[step - 1]
+        assert agents == {agent for agent, position in after.items()
+                          if position == vertex}
+    _check_contains_mate(sim)
@@ -1,9 +1,12 @@
 from mas.graph.Graph import Graph
 from mas.graph.Vertex import Vertex
+from mas.graph.graph_generator import cycle
 
 from mas.agent.VertexManager import VertexManager
 from mas.agent.Agent import Agent
 
+import random
+
 def _trivial_graph():
     G = Graph()
     u = Vertex(1)
@@ -62,9 +65,10 @@ def test_get_agents_on_vertex():
   a3 = Agent()
 
   manager = VertexManager(G, {a1: u, a2: u, a3: w})
-  assert manager.get_agents_on_vertex(u) == [a1, a2]
-  assert manager.get_agents_on_vertex(v) == []
-  assert manager.get_agents_on_vertex(w) == [a3]
+  assert list(manager.get_agents_on_vertex(u)) == [a1, a2]
+  assert list(manager.get_agents_on_vertex(v)) == []
+  assert list(manager.get_agents_on_vertex(w)) == [a3]
+  assert set(manager.get_occupied_positions()) == {u, w}
 
 def test_move_agent():
   G, u, v = _edge_graph()
@@ -73,13 +77,66 @@ def test_move_agent():
   manager = VertexManager(G, {a1: u})
 
   assert manager.move_agent(a1, u, v)
-  assert manager.get_agents_on_vertex(v) == [a1]
+  assert list(manager.get_agents_on_vertex(v)) == [a1]
 
   assert not manager.move_agent(a1, u, v)
-  assert manager.get_agents_on_vertex(v) == [a1]
+  assert list(manager.get_agents_on_vertex(v)) == [a1]
 
   assert not manager.move_agent(a2, v, u)
-  assert manager.get_agents_on_vertex(u) == []
+  assert list(manager.get_agents_on_vertex(u)) == []
+  assert manager.get_occupied_positions() == [v]
+
+def test_occupancy():
+  G, u, v = _edge_graph()
+  a1 = Agent()
+  a2 = Agent()
+  a3 = Agent()
+  manager = VertexManager(G, {a1: u, a2: u, a3: v})
+
+  assert manager.get_occupancy(u) == 2
+  assert list(manager.get_occupancy_vector()) == [2, 1]
+  assert manager.get_most_crowded_vertices() == [(u, 2)]
+
+  manager.move_agent(a1, u, v)
+  manager.move_agent(a2, u, v)
+  assert manager.get_occupancy(u) == 0
+  assert list(manager.get_occupancy_vector()) == [0, 3]
+  assert manager.get_most_crowded_vertices(2) == [(v, 3)]
+  assert list(manager.get_agents_on_vertex(v)) == [a3, a1, a2]
+
+  manager.set_agents_positions({a1: u})
+  assert list(manager.get_occupancy_vector()) == [1, 0]
+
+def test_most_crowded_vertices_after_moves():
+  G = cycle(6)
+  vertices = [G.get_vertex_by_id(i) for i in range(6)]
+  agents = [Agent() for _ in range(20)]
+  positions = {agent: vertices[i % 6] for i, agent in enumerate(agents)}
+  manager = VertexManager(G, positions)
+
+  rng = random.Random(0)
+  for _ in range(300):
+    agent = rng.choice(agents)
+    newpos = rng.choice(vertices)
+    assert manager.move_agent(agent, positions[agent], newpos)
+    positions[agent] = newpos
+
+    counts = [manager.get_occupancy(v) for v in vertices]
+    assert list(manager.get_occupancy_vector()) == counts
+    crowded = manager.get_most_crowded_vertices(3)
+    assert [count for _, count in crowded] == \
+      sorted((c for c in counts if c > 0), reverse=True)[:3]
+    assert all(manager.get_occupancy(v) == count for v, count in crowded)
+
+def test_set_agents_positions():
+  G, u, v = _edge_graph()
+  a1 = Agent()
+  a2 = Agent()
+  manager = VertexManager(G, {a1: u, a2: u})
+
+  manager.set_agents_positions({a1: v, a2: u})
+  assert list(manager.get_agents_on_vertex(u)) == [a2]
+  assert list(manager.get_agents_on_vertex(v)) == [a1]
 
 def test_vertex_contains_pebbles():
   G, u = _trivial_graph()
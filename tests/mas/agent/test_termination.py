@@ -0,0 +1,67 @@
+from mas.agent.Agent import Agent
+from mas.agent.Simulation import Simulation
+from mas.agent.termination import (all_agents_met, all_agents_with_status,
+                                   all_vertices_visited, any_of)
+
+from mas.graph.graph_generator import line
+
+
+def _follow_port_one(agent):
+    agent.move_along(1)
+
+
+def _become_done(agent):
+    if agent.get_id() == 1 or agent.get_sim_step() > 1:
+        agent.become("done")
+
+
+def test_all_vertices_visited():
+    G = line(3)
+    a = Agent(desired_position=G.get_vertex_by_id(0))
+    sim = Simulation(G, agents_list=[a], algorithm=_follow_port_one)
+    a.join_to_simulation(sim)
+
+    assert not all_vertices_visited(sim)
+    assert sim.run(max_steps=10, until=all_vertices_visited) == 2
+    assert sim.get_visited_vertices_number() == 2
+
+    G = line(1)
+    a2 = Agent(desired_position=G.get_vertex_by_id(0))
+    sim = Simulation(G, agents_list=[a2])
+    assert all_vertices_visited(sim)
+
+
+def test_all_agents_met():
+    G = line(3)
+    a1 = Agent(desired_position=G.get_vertex_by_id(0))
+    a2 = Agent(desired_position=G.get_vertex_by_id(2))
+    sim = Simulation(G, agents_list=[a1, a2], algorithm=_follow_port_one)
+    a1.join_to_simulation(sim)
+    a2.join_to_simulation(sim)
+
+    assert not all_agents_met(sim)
+    assert sim.run(max_steps=10, until=all_agents_met) == 2
+    assert all_agents_met(sim)
+
+
+def test_all_agents_with_status():
+    G = line(2)
+    a1 = Agent(desired_id=1, desired_position=G.get_vertex_by_id(0))
+    a2 = Agent(desired_id=2, desired_position=G.get_vertex_by_id(1))
+    sim = Simulation(G, agents_list=[a1, a2], algorithm=_become_done)
+    a1.join_to_simulation(sim)
+    a2.join_to_simulation(sim)
+
+    done = all_agents_with_status("done")
+    assert not done(sim)
+    assert sim.run(max_steps=10, until=done) == 2
+
+
+def test_any_of():
+    G = line(3)
+    a1 = Agent(desired_position=G.get_vertex_by_id(0))
+    a2 = Agent(desired_position=G.get_vertex_by_id(2))
+    sim = Simulation(G, agents_list=[a1, a2])
+
+    assert any_of(all_vertices_visited, all_agents_met)(sim) is False
+    assert any_of(all_agents_met, lambda simulation: True)(sim) is True
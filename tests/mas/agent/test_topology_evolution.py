@@ -0,0 +1,72 @@
+from mas.agent.topology_evolution import (periodic, random_churn,
+                                          t_interval_connected)
+
+from mas.graph.graph_generator import grid
+
+import networkx as nx
+
+
+def _apply(present, evolution, step):
+    added, removed = evolution(None, step)
+    assert not set(added) & present
+    assert set(removed) <= present
+    present -= set(removed)
+    present |= set(added)
+
+
+def test_periodic():
+    edges = [(0, 1), (1, 2), (2, 3)]
+    evolution = periodic(edges, 3, phases=[0, 1, 2])
+    present = set(edges)
+    for step in range(1, 10):
+        _apply(present, evolution, step)
+        assert present == {edges[step % 3]}
+
+
+def test_periodic_first_call():
+    edges = [(0, 1), (1, 2)]
+    evolution = periodic(edges, 2)
+    assert evolution(None, 5) == ([], edges)
+    assert evolution(None, 6) == (edges, [])
+
+
+def test_random_churn():
+    edges = [(i, i + 1) for i in range(50)]
+    evolution = random_churn(edges, 0.3, 0.2, seed=0)
+    present = set(edges)
+    for step in range(1, 30):
+        _apply(present, evolution, step)
+        assert present <= set(edges)
+
+    again = random_churn(edges, 0.3, 0.2, seed=0)
+    present_again = set(edges)
+    for step in range(1, 30):
+        _apply(present_again, again, step)
+    assert present_again == present
+
+
+def test_random_churn_extreme_probabilities():
+    edges = [(i, i + 1) for i in range(10)]
+    evolution = random_churn(edges, 1, 1)
+    assert set(evolution(None, 1)[1]) == set(edges)
+    assert set(evolution(None, 2)[0]) == set(edges)
+
+
+def test_t_interval_connected():
+    G = grid(4, 4)
+    edges = [(u.name(), v.name()) for u, v in G.edges()]
+    vertices = {x for edge in edges for x in edge}
+    T = 3
+    evolution = t_interval_connected(edges, T, seed=1)
+
+    present = set(edges)
+    history = []
+    for step in range(1, 20):
+        _apply(present, evolution, step)
+        history.append(set(present))
+
+    for start in range(len(history) - T + 1):
+        common = set.intersection(*history[start:start + T])
+        H = nx.Graph(list(common))
+        assert set(H.nodes) == vertices
+        assert nx.is_connected(H)
@@ -1,10 +1,11 @@
 
 from mas.graph.Graph import Graph
 from mas.graph.Vertex import Vertex
-from mas.graph.graph_generator import clique, tree
+from mas.graph.graph_generator import clique, cycle, tree
 
 import numpy as np
 import os
+import pytest
 
 path = os.getcwd()
 tests_path = os.path.join(path, "tests")
@@ -87,6 +88,39 @@ def test_remove_vertex():
     assert not G.remove_vertex(v)
 
 
+def test_remove_vertex_with_edges():
+    G = cycle(5)
+    u = G.get_vertex_by_id(1)
+    last = G.get_vertex_by_id(4)
+
+    assert G.remove_vertex(u)
+    assert G.order() == 4
+    assert G.size() == 3
+    assert G.get_vertex_id(last) == 1
+    assert G.get_vertex_by_id(1) is last
+    assert G.get_vertex_by_id(4) is None
+    assert u.get_neighbors() == []
+    assert all(u not in edge for edge in G.edges())
+
+    x = G.get_vertex_by_id(0)
+    y = G.get_vertex_by_id(1)
+    assert G.remove_edge(y, x)
+    assert G.size() == 2
+    assert not G.is_connected()
+
+
+def test_remove_vertices():
+    G = clique(6)
+    vertices = [G.get_vertex_by_id(i) for i in (0, 2, 5)]
+
+    assert G.remove_vertices(vertices + [Vertex(7)]) == 3
+    assert G.order() == 3
+    assert G.size() == 3
+    assert sorted(G.vertices().values()) == [0, 1, 2]
+    assert G.diameter() == 1
+    assert G.remove_vertices([]) == 0
+
+
 def test_id_in_G():
     G = Graph()
 
@@ -266,6 +300,60 @@ def test_init_from_graph():
                for (u, v) in G2.edges()]) == {(1, 3), (1, 5), (3, 5)}
 
 
+def test_init_from_graph_same_names_and_ports():
+    G1 = Graph()
+    u = Vertex("x")
+    v = Vertex("x")
+    w = Vertex("y")
+    G1.add_vertex(u)
+    G1.add_vertex(v)
+    G1.add_vertex(w)
+    G1.add_edge(u, v)
+    G1.add_edge(u, w)
+    u.reset_port_associations({4: w, 2: v})
+
+    G2 = Graph()
+    G2.init_from_graph(G1)
+    u2 = G2.get_vertex_by_id(0)
+    v2 = G2.get_vertex_by_id(1)
+    w2 = G2.get_vertex_by_id(2)
+
+    assert u2 is not u
+    assert u2.get_neighbors() == [v2, w2]
+    assert u2.get_port_associations() == {4: w2, 2: v2}
+    assert v2.get_port_associations() == {0: u2}
+    assert G2.edges() == {(u2, v2), (u2, w2)}
+
+    G3 = Graph()
+    G3.init_from_graph(G1, copy=False)
+    assert G3.get_vertex_by_id(0) is u
+    assert G3.edges() == G1.edges()
+
+
+def test_init_from_graph_shares_matrices():
+    G1 = cycle(6)
+    D = G1.distance_matrix().copy()
+    A = G1.adjacency_matrix().copy()
+
+    G2 = Graph()
+    G2.init_from_graph(G1)
+    assert np.array_equal(G2.distance_matrix(), D)
+    assert np.shares_memory(G2.distance_matrix(), G1.distance_matrix())
+    assert G2.cache_statistics()["distances"]["rebuilds"] == 0
+
+    u = G2.get_vertex_by_id(0)
+    v = G2.get_vertex_by_id(3)
+    G2.add_edge(u, v)
+    assert G2.distance(u, v) == 1
+    assert G2.adjacency_matrix()[0, 3] == 1
+    assert np.array_equal(G1.distance_matrix(), D)
+    assert np.array_equal(G1.adjacency_matrix(), A)
+
+    G1.remove_edge(G1.get_vertex_by_id(0), G1.get_vertex_by_id(1))
+    assert G1.diameter() == 5
+    assert G2.diameter() == 3
+
+
 def test_init_from_adjacency_matrix():
     G = Graph()
     G.init_from_adjacency_matrix(M)
@@ -290,6 +378,24 @@ def test_init_from_file():
         "342").get_neighbors()] == ["0", "2"]
 
 
+def test_init_from_file_whitespaces_and_progress():
+    file = os.path.join(test_out_path, "whitespaces.txt")
+    with open(file, "w") as f:
+        f.write("a  b\tc d\n\na b   c x\n  c a\t\n")
+    calls = []
+
+    G = Graph()
+    G.init_from_file(file, progress=lambda read, total: calls.append(
+        (read, total)))
+
+    assert G.order() == 4
+    assert G.size() == 2
+    assert [v.name() for v in G.get_vertex_by_name("a").get_neighbors()] == \
+        ["b", "c"]
+    assert G.get_vertex_by_name("d").get_neighbors() == []
+    assert calls[-1] == (os.path.getsize(file), os.path.getsize(file))
+
+
 def test_order():
     G = Graph()
 
@@ -357,6 +463,50 @@ def test_compute_adjacency_matrix_after_remove_and_add():
     assert np.array_equal(G.adjacency_matrix(), np.array([[0, 1], [1, 0]]))
 
 
+def test_sparse_adjacency():
+    G = Graph()
+
+    u = Vertex(1)
+    v = Vertex(3)
+    w = Vertex(5)
+
+    G.add_vertex(u)
+    G.add_vertex(v)
+    G.add_vertex(w)
+    G.add_edge(u, v)
+    G.add_edge(v, w)
+
+    A = G.sparse_adjacency()
+    assert A.indptr.dtype == np.int32
+    assert A.indices.dtype == np.int32
+    assert list(A.indices[A.indptr[1]:A.indptr[2]]) == [0, 2]
+    assert np.array_equal(A.toarray(), M)
+
+    G.remove_vertex(u)
+    assert np.array_equal(G.sparse_adjacency().toarray(),
+                          np.array([[0, 1], [1, 0]]))
+
+
+def test_port_table():
+    G = cycle(3)
+
+    indptr, indices, ports = G.port_table()
+    assert list(indptr) == [0, 2, 4, 6]
+    for i in range(3):
+        vertex = G.get_vertex_by_id(i)
+        for j in range(indptr[i], indptr[i + 1]):
+            neighbor = vertex.get_neighbor_by_port(ports[j])
+            assert G.get_vertex_id(neighbor) == indices[j]
+
+    u = Vertex(3)
+    G.add_vertex(u)
+    G.add_edge(u, G.get_vertex_by_id(1))
+    indptr, indices, ports = G.port_table()
+    assert list(indptr) == [0, 2, 5, 7, 8]
+    assert indices[4] == 3 and ports[4] == 2
+    assert indices[7] == 1 and ports[7] == 0
+
+
 def test_compute_distance_matrix():
     G = Graph()
     G.init_from_adjacency_matrix(M)
@@ -428,6 +578,38 @@ def test_is_planar():
     assert G.is_planar()
 
 
+def test_is_planar_memoized():
+    # K3,3 is not planar although it respects the 3n - 6 edge bound.
+    G = Graph.from_edge_arrays(6, [0, 0, 0, 1, 1, 1, 2, 2, 2],
+                               [3, 4, 5, 3, 4, 5, 3, 4, 5])
+    version = G.version()
+
+    assert not G.is_planar()
+    assert not G.is_planar()
+    assert G.version() == version
+    assert G.cache_statistics()["planarity"] == {"rebuilds": 1,
+                                                  "avoided_rebuilds": 0}
+
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(1)
+    G.add_edge(u, v)
+    assert G.version() == version + 1
+    assert not G.is_planar()
+    assert G.cache_statistics()["planarity"] == {"rebuilds": 1,
+                                                  "avoided_rebuilds": 1}
+
+    G.remove_edge(u, v)
+    G.remove_edge(u, G.get_vertex_by_id(3))
+    assert G.is_planar()
+    assert G.cache_statistics()["planarity"]["rebuilds"] == 2
+
+
+def test_is_planar_edge_bounds():
+    assert clique(4).is_planar()
+    assert not clique(100).is_planar()
+    assert tree(200).is_planar()
+
+
 def test_save_graphids():
     G1 = Graph()
 
@@ -478,6 +660,41 @@ def test_save_realids():
     assert (u2, v2) in G2.edges()
 
 
+def test_save_binary():
+    G1 = cycle(6)
+    u = G1.get_vertex_by_id(2)
+    u.reset_port_associations({
+        3 * port: neighbor
+        for port, neighbor in u.get_port_associations().items()
+    })
+    file = os.path.join(test_out_path, "test_save_binary.bin")
+    G1.save_binary(file)
+
+    G2 = Graph()
+    G2.init_from_binary_file(file)
+
+    assert G2.order() == G1.order()
+    assert G2.size() == G1.size()
+    for i in range(G1.order()):
+        v1 = G1.get_vertex_by_id(i)
+        v2 = G2.get_vertex_by_id(i)
+        assert v2.name() == v1.name()
+        assert [G2.get_vertex_id(v) for v in v2.get_neighbors()] == \
+            [G1.get_vertex_id(v) for v in v1.get_neighbors()]
+        assert {p: G2.get_vertex_id(v)
+                for p, v in v2.get_port_associations().items()} == \
+            {p: G1.get_vertex_id(v)
+             for p, v in v1.get_port_associations().items()}
+    for array1, array2 in zip(G1.port_table(), G2.port_table()):
+        assert np.array_equal(array1, array2)
+
+    v = G2.get_vertex_by_id(2)
+    w = Vertex("w")
+    G2.add_vertex(w)
+    G2.add_edge(v, w)
+    assert v.get_port_by_neighbor(w) == 1
+
+
 def test_is_connected():
     G1 = tree(10)
 
@@ -486,3 +703,219 @@ def test_is_connected():
     G2 = Graph()
     file = os.path.join(test_res_path, "disconnected_graph.txt")
     G2.init_from_file(file)
+
+
+def test_distance_matrix_disconnected():
+    G = Graph()
+    G.init_from_adjacency_matrix(M)
+    u = Vertex(7)
+    G.add_vertex(u)
+
+    D = G.distance_matrix()
+    assert np.issubdtype(D.dtype, np.integer)
+    assert np.array_equal(D[:3, :3], np.array(
+        [[0, 1, 2], [1, 0, 1], [2, 1, 0]]))
+    assert (D[3, :3] == Graph.INFTY).all()
+    assert (D[:3, 3] == Graph.INFTY).all()
+    assert G.distance(u, u) == 0
+    assert G.diameter() == Graph.INFTY
+
+
+def test_diameter_cycle():
+    G = cycle(11)
+
+    assert G.diameter() == 5
+    assert G.distance(G.get_vertex_by_id(0), G.get_vertex_by_id(6)) == 5
+
+
+def test_distances_from():
+    G = cycle(6)
+    u = G.get_vertex_by_id(0)
+
+    assert list(G.distances_from(u)) == [0, 1, 2, 3, 2, 1]
+    assert not G._distance_matrix_computed
+
+    G.distance_matrix()
+    assert list(G.distances_from(u)) == [0, 1, 2, 3, 2, 1]
+
+
+def test_distance_cache_budget():
+    G = cycle(6)
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(1)
+    w = G.get_vertex_by_id(2)
+
+    G.set_distance_cache_budget(2 * G.distances_from(u).nbytes)
+    assert G.distance(v, w) == 1
+    assert G.distance(u, w) == 2
+    assert G.distance(w, u) == 2
+    assert list(G._distance_rows) == [0, 2]
+
+    G.set_distance_cache_budget(0)
+    assert list(G._distance_rows) == [2]
+
+    G.remove_edge(v, w)
+    assert G.distance(w, u) == 4
+
+
+def test_incremental_distances():
+    G = Graph()
+    G.init_from_adjacency_matrix(np.roll(np.eye(8, dtype=int), 1, axis=1) +
+                                 np.roll(np.eye(8, dtype=int), -1, axis=1))
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(4)
+    G.distance_matrix()
+
+    G.add_edge(u, v)
+    assert G.diameter() == 4
+    assert G.distance(G.get_vertex_by_id(1), G.get_vertex_by_id(5)) == 3
+
+    G.remove_edge(u, G.get_vertex_by_id(1))
+    H = Graph()
+    H.init_from_adjacency_matrix(G.adjacency_matrix())
+    assert np.array_equal(G.distance_matrix(), H.distance_matrix())
+    assert G.diameter() == H.diameter()
+
+    statistics = G.cache_statistics()
+    assert statistics["distances"] == {"rebuilds": 1, "avoided_rebuilds": 2}
+
+
+def test_incremental_connectivity():
+    G = Graph()
+    u = Vertex(1)
+    v = Vertex(3)
+    G.add_vertex(u)
+    G.add_vertex(v)
+
+    assert not G.is_connected()
+    G.add_edge(u, v)
+    assert G.is_connected()
+
+    w = Vertex(5)
+    G.add_vertex(w)
+    assert not G.is_connected()
+    G.add_edge(w, v)
+    assert G.is_connected()
+
+    statistics = G.cache_statistics()
+    assert statistics["connectivity"] == {"rebuilds": 1, "avoided_rebuilds": 3}
+
+    G.remove_edge(w, v)
+    assert not G.is_connected()
+    assert G.cache_statistics()["connectivity"] == {"rebuilds": 1,
+                                                     "avoided_rebuilds": 4}
+
+
+def test_batch():
+    G = cycle(6)
+    G.distance_matrix()
+    G.is_connected()
+    vertices = [G.get_vertex_by_id(i) for i in range(6)]
+
+    with G.batch():
+        G.add_edge(vertices[0], vertices[3])
+        assert G.distance(vertices[0], vertices[3]) == 1
+        with G.batch():
+            G.remove_edge(vertices[0], vertices[1])
+            G.add_vertex(Vertex(6))
+        G.add_edge(vertices[1], vertices[4])
+    assert G.diameter() == Graph.INFTY
+    assert G.distance(vertices[0], vertices[1]) == 3
+    assert not G.is_connected()
+
+    statistics = G.cache_statistics()
+    assert statistics["distances"]["avoided_rebuilds"] == 0
+    assert statistics["connectivity"]["avoided_rebuilds"] == 0
+
+
+def test_connected_components():
+    G = Graph.from_edge_arrays(6, [0, 1, 3], [1, 2, 4])
+    vertices = list(G.vertices())
+
+    components = G.connected_components()
+    assert sorted(sorted(v.name() for v in c) for c in components) == \
+        [[0, 1, 2], [3, 4], [5]]
+    assert G.component_of(vertices[4]) == {vertices[3], vertices[4]}
+    assert G.component_of(Vertex(7)) is None
+
+    G.add_edge(vertices[2], vertices[3])
+    assert len(G.connected_components()) == 2
+    assert G.component_of(vertices[0]) == set(vertices[:5])
+
+    # Removing an edge of a cycle keeps the components unchanged.
+    G.add_edge(vertices[0], vertices[4])
+    G.remove_edge(vertices[2], vertices[3])
+    assert G.component_of(vertices[0]) == set(vertices[:5])
+
+    G.remove_edge(vertices[0], vertices[4])
+    assert G.component_of(vertices[4]) == {vertices[3], vertices[4]}
+    assert G.component_of(vertices[2]) == set(vertices[:3])
+    assert G.cache_statistics()["connectivity"]["rebuilds"] == 1
+
+
+def test_connected_components_random_updates():
+    rng = np.random.default_rng(0)
+    G = Graph.from_edge_arrays(12, rng.integers(12, size=10),
+                               rng.integers(12, size=10))
+    vertices = list(G.vertices())
+    G.connected_components()
+
+    for _ in range(200):
+        u, v = (vertices[i] for i in rng.choice(12, 2, replace=False))
+        if u in v.get_neighbors():
+            G.remove_edge(u, v)
+        else:
+            G.add_edge(u, v)
+
+        expected = Graph.from_edge_arrays(
+            12, [G.get_vertex_id(u) for u, _ in G.edges()],
+            [G.get_vertex_id(v) for _, v in G.edges()])
+        assert sorted(sorted(G.get_vertex_id(w) for w in c)
+                      for c in G.connected_components()) == \
+            sorted(sorted(w.name() for w in c)
+                   for c in expected.connected_components())
+        for w in vertices:
+            assert w in G.component_of(w)
+    assert G.cache_statistics()["connectivity"]["rebuilds"] == 1
+
+
+def test_from_edge_arrays():
+    G = Graph.from_edge_arrays(4, [0, 1, 2, 1, 3], [1, 2, 0, 0, 3])
+
+    assert G.order() == 4
+    assert G.size() == 3
+    assert [v.name() for v in G.vertices()] == [0, 1, 2, 3]
+
+    u = G.get_vertex_by_id(0)
+    v = G.get_vertex_by_id(1)
+    w = G.get_vertex_by_id(2)
+    assert u.get_port_associations() == {0: v, 1: w}
+    assert v.get_port_associations() == {0: u, 1: w}
+    assert w.get_port_associations() == {0: v, 1: u}
+    assert G.get_vertex_by_id(3).get_neighbors() == []
+
+
+def test_from_edge_arrays_with_ports_and_names():
+    G = Graph.from_edge_arrays(3, [0, 1], [1, 2],
+                               ports=([2, 0], [1, 3]),
+                               names=["a", "b", "c"])
+
+    a = G.get_vertex_by_name("a")
+    b = G.get_vertex_by_name("b")
+    c = G.get_vertex_by_name("c")
+    assert a.get_port_associations() == {2: b}
+    assert b.get_port_associations() == {1: a, 0: c}
+    assert c.get_port_associations() == {3: b}
+
+    x = Vertex("x")
+    G.add_vertex(x)
+    G.add_edge(a, x)
+    assert a.get_port_by_neighbor(x) == 0
+
+    # Only the ports of the first occurrence of an edge are used.
+    G = Graph.from_edge_arrays(3, [0, 1, 0], [1, 0, 2],
+                               ports=([0, 0, 1], [0, 1, 0]))
+    a = G.get_vertex_by_id(0)
+    assert G.get_vertex_by_id(1).get_port_associations() == {0: a}
+    with pytest.raises(ValueError):
+        Graph.from_edge_arrays(3, [0, 0], [1, 2], ports=([0, 0], [0, 0]))
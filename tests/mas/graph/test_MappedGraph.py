@@ -0,0 +1,103 @@
+from mas.agent.Agent import Agent
+from mas.agent.Simulation import Simulation
+from mas.graph.Graph import Graph
+from mas.graph.MappedGraph import MappedGraph
+from mas.graph.graph_generator import grid, line
+
+import numpy as np
+import os
+import pickle
+
+path = os.getcwd()
+tests_path = os.path.join(path, "tests")
+test_out_path = os.path.join(tests_path, "out")
+
+try:
+    os.mkdir(test_out_path)
+except OSError:
+    pass
+
+
+def _follow_port_zero(agent):
+    agent.move_along(0)
+
+
+def _mapped(G, name, distances=False):
+    file = os.path.join(test_out_path, name)
+    G.save_binary(file, distances=distances)
+    return MappedGraph(file)
+
+
+def test_order_size_and_type():
+    G = grid(3, 4)
+    M = _mapped(G, "test_order_size_and_type.bin")
+
+    assert M.order() == 12
+    assert M.size() == 17
+    assert M.type() == G.type()
+    assert len(M.vertices()) == 12
+    assert len(M.edges()) == 17
+
+
+def test_vertices_and_ports():
+    G = grid(3, 3)
+    M = _mapped(G, "test_vertices_and_ports.bin")
+
+    for i in range(G.order()):
+        u = G.get_vertex_by_id(i)
+        m = M.get_vertex_by_id(i)
+        assert m == M.get_vertex_by_name(u.name())
+        assert M.get_vertex_id(m) == i
+        assert m.get_ports() == u.get_ports()
+        for port in u.get_ports():
+            neighbor = m.get_neighbor_by_port(port)
+            assert neighbor.name() == u.get_neighbor_by_port(port).name()
+            assert m.get_port_by_neighbor(neighbor) == port
+        assert m.get_neighbor_by_port(4) is None
+
+    assert M.get_vertex_by_id(9) is None
+    assert M.get_vertex_by_name("x") is None
+    assert M.get_vertex_id(G.get_vertex_by_id(0)) is None
+
+
+def test_distances():
+    G = Graph()
+    G.init_from_adjacency_matrix(np.array([
+        [0, 1, 0, 0],
+        [1, 0, 1, 0],
+        [0, 1, 0, 0],
+        [0, 0, 0, 0]
+    ]))
+    M = _mapped(G, "test_distances.bin")
+    M_saved = _mapped(G, "test_distances_saved.bin", distances=True)
+
+    for mapped in (M, M_saved):
+        assert np.array_equal(mapped.distance_matrix(), G.distance_matrix())
+        assert mapped.diameter() == MappedGraph.INFTY
+        assert mapped.distance(mapped.get_vertex_by_id(0),
+                               mapped.get_vertex_by_id(2)) == 2
+        assert not mapped.is_connected()
+
+
+def test_pickle():
+    M = _mapped(line(5), "test_pickle.bin")
+    copy = pickle.loads(pickle.dumps(M))
+
+    assert copy.order() == 5
+    assert np.array_equal(copy.port_table()[2], M.port_table()[2])
+
+
+def test_simulation_on_mapped_graph():
+    M = _mapped(line(4), "test_simulation_on_mapped_graph.bin")
+    u = M.get_vertex_by_id(1)
+
+    a = Agent(desired_position=u)
+    sim = Simulation(M, agents_list=[a], algorithm=_follow_port_zero)
+    a.join_to_simulation(sim)
+    manager = sim.get_agents_manager()
+
+    sim.step_algo()
+    assert manager.get_agent_position(a) == M.get_vertex_by_id(0)
+    assert manager.get_agent_port_back(a) == 1
+    sim.step_algo()
+    assert manager.get_agent_position(a) == M.get_vertex_by_id(0)
@@ -33,6 +33,22 @@ def test_remove_neighbor():
     assert u.get_neighbors() == []
 
 
+def test_get_neighbors_cached():
+    u = Vertex(1)
+    v = Vertex(2)
+    w = Vertex(3)
+
+    u.add_neighbor(v)
+    neighbors = u.get_neighbors()
+    assert u.get_neighbors() is neighbors
+
+    u.add_neighbor(w)
+    assert u.get_neighbors() == [v, w]
+    u.remove_neighbor(v)
+    assert u.get_neighbors() == [w]
+    assert neighbors == [v]
+
+
 def test_copy():
     u1 = Vertex(13)
     v = Vertex(1)
@@ -207,3 +223,46 @@ def test_get_port_by_neighbor():
 
     y = Vertex(5)
     assert u.get_port_by_neighbor(y) is None
+
+
+def test_unused_ports_reused_smallest_first():
+    u = Vertex(1)
+    neighbors = [Vertex(i) for i in range(4)]
+    for v in neighbors:
+        u.add_neighbor(v)
+
+    u.remove_neighbor(neighbors[3])
+    u.remove_neighbor(neighbors[1])
+
+    x = Vertex(5)
+    y = Vertex(6)
+    z = Vertex(7)
+    u.add_neighbor(x)
+    u.add_neighbor(y)
+    u.add_neighbor(z)
+    assert u.get_port_by_neighbor(x) == 1
+    assert u.get_port_by_neighbor(y) == 3
+    assert u.get_port_by_neighbor(z) == 4
+    assert u.get_neighbors() == [neighbors[0], neighbors[2], x, y, z]
+
+
+def test_add_neighbor_after_reset_port_associations():
+    u = Vertex(1)
+    v = Vertex(2)
+    w = Vertex(3)
+    x = Vertex(4)
+
+    u.add_neighbor(v)
+    u.add_neighbor(w)
+    assert u.reset_port_associations({3: v, 5: w})
+
+    u.add_neighbor(x)
+    assert u.get_port_by_neighbor(x) == 6
+    assert u.get_port_by_neighbor(w) == 5
+    assert u.get_neighbor_by_port(3) == v
+
+
+def test_vertex_has_no_dict():
+    u = Vertex(1)
+
+    assert not hasattr(u, "__dict__")
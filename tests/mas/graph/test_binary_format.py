@@ -0,0 +1,72 @@
+from mas.graph import binary_format
+
+import json
+import numpy as np
+import os
+import pytest
+import struct
+
+path = os.getcwd()
+tests_path = os.path.join(path, "tests")
+test_out_path = os.path.join(tests_path, "out")
+
+try:
+    os.mkdir(test_out_path)
+except OSError:
+    pass
+
+
+def test_write_and_read():
+    file = os.path.join(test_out_path, "test_write_and_read.bin")
+    indptr = np.array([0, 2, 3, 4])
+    indices = np.array([1, 2, 0, 0])
+    ports = np.array([0, 1, 0, 5])
+    names = ["a", 1, (2, 3)]
+    binary_format.write(file, indptr, indices, ports, names, type="test")
+
+    for mmap in (False, True):
+        content = binary_format.read(file, mmap=mmap)
+        assert np.array_equal(content["indptr"], indptr)
+        assert np.array_equal(content["indices"], indices)
+        assert np.array_equal(content["ports"], ports)
+        assert content["names"] == ["a", 1, "(2, 3)"]
+        assert content["type"] == "test"
+        assert content["distances"] is None
+        for name in ("indptr", "indices", "ports"):
+            assert content[name].dtype == np.int32
+            assert isinstance(content[name], np.memmap) == mmap
+
+
+def test_write_and_read_distances():
+    file = os.path.join(test_out_path, "test_write_and_read_distances.bin")
+    distances = np.array([[0, 1, 9999], [1, 0, 9999], [9999, 9999, 0]],
+                         np.int16)
+    binary_format.write(file, [0, 1, 2, 2], [1, 0], [0, 0], [0, 1, 2],
+                        distances=distances)
+
+    for mmap in (False, True):
+        content = binary_format.read(file, mmap=mmap)
+        assert content["distances"].dtype == np.int16
+        assert np.array_equal(content["distances"], distances)
+
+
+def test_read_invalid_file():
+    file = os.path.join(test_out_path, "test_read_invalid_file.bin")
+    with open(file, "w") as f:
+        f.write("0 1\n0 1\n")
+
+    with pytest.raises(ValueError):
+        binary_format.read(file)
+
+
+def test_read_previous_version():
+    file = os.path.join(test_out_path, "test_read_previous_version.bin")
+    header = json.dumps({"order": 1, "size": 0, "names": ["a"],
+                         "indptr": [64, 2], "indices": [72, 0],
+                         "ports": [72, 0]}).encode()
+    with open(file, "wb") as f:
+        f.write(binary_format.MAGIC + struct.pack("<II", 1, len(header)))
+        f.write(header)
+
+    with pytest.raises(ValueError, match="unsupported version"):
+        binary_format.read(file)
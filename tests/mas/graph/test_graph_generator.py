@@ -28,3 +28,42 @@ def test_cycle_ports():
   assert v.get_neighbor_by_port(1) == w
   assert w.get_neighbor_by_port(1) == u
 
+
+def test_grid_ports():
+  G = grid(2, 3)
+  u = G.get_vertex_by_name("(1,1)")
+
+  assert G.order() == 6
+  assert G.size() == 7
+  assert u.get_neighbor_by_port(0) == G.get_vertex_by_name("(1,0)")
+  assert u.get_neighbor_by_port(1) == G.get_vertex_by_name("(0,1)")
+  assert u.get_neighbor_by_port(2) == G.get_vertex_by_name("(1,2)")
+
+def test_clique_and_trees():
+  assert clique(6).size() == 15
+  assert binary_tree(3).size() == 6
+  assert star(5).size() == 4
+
+  G = tree(30)
+  assert G.size() == 29
+  assert G.is_connected()
+
+def test_random_graph_seed():
+  G1 = random_graph(50, 0.2, seed=7)
+  G2 = random_graph(50, 0.2, seed=7)
+
+  edges1 = {(u.name(), v.name()) for (u, v) in G1.edges()}
+  edges2 = {(u.name(), v.name()) for (u, v) in G2.edges()}
+  assert edges1 == edges2
+  assert all(i < j for (i, j) in edges1)
+
+def test_random_graph_extreme_probabilities():
+  assert random_graph(10, 0, connected=False).size() == 0
+  assert random_graph(10, 0).size() == 9
+  assert random_graph(10, 1).size() == 45
+
+def test_random_graph_connected():
+  G = random_graph(200, 0.001, connected=True, seed=3)
+
+  assert G.is_connected()
+  assert G.type().startswith("random connected")
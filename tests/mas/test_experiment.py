@@ -0,0 +1,55 @@
+from mas.experiment import parameter_grid, run_experiment
+
+import numpy as np
+
+
+def test_parameter_grid():
+    grid = parameter_grid(topology="grid", size=[(2, 2), (3, 3)],
+                          agents_number=[1, 2], synchronous=True)
+    assert grid == [
+        {"topology": "grid", "size": (2, 2), "agents_number": 1,
+         "synchronous": True},
+        {"topology": "grid", "size": (2, 2), "agents_number": 2,
+         "synchronous": True},
+        {"topology": "grid", "size": (3, 3), "agents_number": 1,
+         "synchronous": True},
+        {"topology": "grid", "size": (3, 3), "agents_number": 2,
+         "synchronous": True},
+    ]
+
+
+def test_run_experiment():
+    grid = parameter_grid(topology=["cycle", "clique"], size=5,
+                          agents_number=[1, 2])
+    result = run_experiment(grid, repetitions=3, seed=0, workers=0)
+
+    assert len(result["steps"]) == 12
+    assert list(result["topology"][:6]) == ["cycle"] * 6
+    assert list(result["agents_number"][:6]) == [1, 1, 1, 2, 2, 2]
+    assert list(result["repetition"]) == [0, 1, 2] * 4
+    assert len(set(result["seed"])) == 12
+    assert (result["cover_time"] == result["steps"]).all()
+    single = result["agents_number"] == 1
+    assert (result["cover_time"][single] >= 4).all()
+    assert (result["meeting_time"][single] == 0).all()
+    assert (result["moves"][single] == result["steps"][single]).all()
+
+
+def test_run_experiment_reproducible():
+    grid = parameter_grid(topology="random_graph", size=(10, 0.5, True),
+                          agents_number=2, algorithm="random_walk")
+    first = run_experiment(grid, repetitions=4, until="met", max_steps=50,
+                           seed=7, workers=0)
+    second = run_experiment(grid, repetitions=4, until="met", max_steps=50,
+                            seed=7, workers=2)
+    for name in ("seed", "steps", "moves", "cover_time", "meeting_time"):
+        assert np.array_equal(first[name], second[name])
+    assert (first["steps"] <= 50).all()
+
+
+def test_run_experiment_kernel():
+    grid = parameter_grid(topology="grid", size=(4, 4), agents_number=3,
+                          kernel=[None, "random_walk_kernel"])
+    result = run_experiment(grid, repetitions=5, seed=1, workers=0)
+    assert (result["cover_time"] >= 5).all()
+    assert (result["moves"] == 3 * result["steps"]).all()
@@ -0,0 +1,44 @@
+from mas.run import main
+
+import pytest
+
+
+def test_main_until(capsys):
+    assert main(["grid", "3", "3", "--agents", "2", "--until", "visited",
+                 "--seed", "0"]) == 0
+    output = capsys.readouterr().out
+    assert "terminated: True" in output
+
+
+def test_main_max_steps(capsys):
+    assert main(["cycle", "4", "--max-steps", "7", "--until", "met"]) == 0
+    assert main(["line", "5", "--algorithm", "nothing", "--agents", "2",
+                 "--max-steps", "3", "--until", "visited"]) == 1
+    output = capsys.readouterr().out
+    assert "steps: 3\nterminated: False" in output
+
+
+def test_main_kernel(capsys):
+    assert main(["grid", "4", "4", "--agents", "3", "--kernel", "--until",
+                 "visited", "--seed", "0"]) == 0
+    assert "terminated: True" in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        main(["cycle", "4", "--algorithm", "nothing", "--kernel",
+              "--max-steps", "3"])
+
+
+def test_main_seed(capsys):
+    for topology in (["random_graph", "30", "0.1"], ["tree", "30"]):
+        outputs = []
+        for _ in range(2):
+            main(topology + ["--agents", "3", "--until", "visited",
+                             "--max-steps", "5000", "--seed", "3"])
+            output = capsys.readouterr().out
+            outputs.append([line for line in output.splitlines()
+                            if not line.startswith("time:")])
+        assert outputs[0] == outputs[1]
+
+
+def test_main_without_termination():
+    with pytest.raises(SystemExit):
+        main(["cycle", "4"])
@@ -93,6 +93,8 @@ def test_get_all_layout_methods():
     G = GraphViz()
     G.init_from_graph(K5)
 
+    assert set(G.get_all_layout_methods()) == all
+    # A second call on the non-planar K5 must not fail nor change the result.
     assert set(G.get_all_layout_methods()) == all
 
     u = G.get_vertex_by_id(0)
@@ -142,3 +144,17 @@ def test_get_vertex_by_tag():
     assert G.get_vertex_by_tag("vertex1") == v
     assert G.get_vertex_by_tag("bidule3") is None
     assert G.get_vertex_by_tag("agent1") is None
+
+
+def test_positions_after_batch():
+    G = GraphViz()
+    G.init_from_graph(clique(4))
+    G.get_vertex_position(G.get_vertex_by_id(0))
+
+    w = Vertex(4)
+    with G.batch():
+        G.add_vertex(w)
+        G.add_edge(w, G.get_vertex_by_id(0))
+        G.remove_vertex(G.get_vertex_by_id(1))
+
+    assert G.get_vertex_position(w) is not None